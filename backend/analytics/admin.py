@@ -0,0 +1,28 @@
+from django.contrib import admin
+
+from .models import DailyCategorySales, DailyCouponUsage, DailyProductSales, DailyStatusSales
+
+
+@admin.register(DailyStatusSales)
+class DailyStatusSalesAdmin(admin.ModelAdmin):
+    list_display = ("day", "status", "order_count", "revenue", "discount")
+    list_filter = ("status",)
+    date_hierarchy = "day"
+
+
+@admin.register(DailyProductSales)
+class DailyProductSalesAdmin(admin.ModelAdmin):
+    list_display = ("day", "product_name", "quantity", "revenue", "order_count")
+    date_hierarchy = "day"
+
+
+@admin.register(DailyCategorySales)
+class DailyCategorySalesAdmin(admin.ModelAdmin):
+    list_display = ("day", "category_name", "quantity", "revenue", "order_count")
+    date_hierarchy = "day"
+
+
+@admin.register(DailyCouponUsage)
+class DailyCouponUsageAdmin(admin.ModelAdmin):
+    list_display = ("day", "code", "order_count", "discount", "revenue")
+    date_hierarchy = "day"
@@ -0,0 +1,92 @@
+from django.db import models
+
+from coupons.models import Coupon
+from orders.models import OrderStatus
+from products.models import Category, Product
+
+
+class DailyStatusSales(models.Model):
+    """Orders placed on `day` that are now in `status`, with their amounts."""
+    day = models.DateField()
+    status = models.CharField(max_length=32, choices=OrderStatus.choices)
+    order_count = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    discount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        db_table = "analytics_daily_status_sales"
+        constraints = [
+            models.UniqueConstraint(fields=["day", "status"], name="uniq_analytics_status_day"),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.status}: {self.order_count}"
+
+
+class DailyProductSales(models.Model):
+    """Units and revenue per product for the counted orders placed on `day`."""
+    day = models.DateField()
+    product = models.ForeignKey(Product, on_delete=models.SET_NULL, null=True, related_name="+")
+    product_name = models.CharField(max_length=255)
+    quantity = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    order_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "analytics_daily_product_sales"
+        constraints = [
+            models.UniqueConstraint(fields=["day", "product"], name="uniq_analytics_product_day"),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.product_name}: {self.quantity}"
+
+
+class DailyCategorySales(models.Model):
+    """Units and revenue per category for the counted orders placed on `day`."""
+    day = models.DateField()
+    category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, related_name="+")
+    category_name = models.CharField(max_length=255)
+    quantity = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    order_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "analytics_daily_category_sales"
+        constraints = [
+            models.UniqueConstraint(fields=["day", "category"], name="uniq_analytics_category_day"),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.category_name}: {self.quantity}"
+
+
+class DailyCouponUsage(models.Model):
+    """Counted orders placed on `day` with a coupon, and the discount given."""
+    day = models.DateField()
+    coupon = models.ForeignKey(Coupon, on_delete=models.SET_NULL, null=True, related_name="+")
+    code = models.CharField(max_length=255)
+    order_count = models.PositiveIntegerField(default=0)
+    discount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        db_table = "analytics_daily_coupon_usage"
+        constraints = [
+            models.UniqueConstraint(fields=["day", "coupon"], name="uniq_analytics_coupon_day"),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.code}: {self.order_count}"
+
+
+class RollupWatermark(models.Model):
+    """Order changes up to `processed_until` are in the rollups (one row)."""
+    processed_until = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "analytics_rollup_watermarks"
+
+    def __str__(self):
+        return f"Rollups up to {self.processed_until}"
@@ -0,0 +1,173 @@
+# analytics/rollups.py
+"""
+Daily sales rollups.
+
+Orders are bucketed by the (UTC) day they were placed. Each run reads the
+orders whose `updated_at` moved past the watermark, collects the days they
+were placed on, and rebuilds every rollup row of those days from
+`orders` / `order_items` with a handful of grouped queries; so a status
+change on an old order corrects its day, and re-running is harmless.
+Cancelled and rejected orders only show up in the per-status counts.
+
+The watermark trails `now` by SETTLE_SECONDS so an order written by a
+transaction that was still open when a run started is not skipped.
+Deleting the RollupWatermark row makes the next run rebuild all history.
+"""
+from __future__ import annotations
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, Max, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from orders.models import Order, OrderItem, OrderStatus
+
+from .models import (
+    DailyCategorySales,
+    DailyCouponUsage,
+    DailyProductSales,
+    DailyStatusSales,
+    RollupWatermark,
+)
+
+SETTLE_SECONDS = 120
+
+# Orders in these states are not sales
+UNCOUNTED_STATUSES = (OrderStatus.CANCELLED, OrderStatus.REJECTED)
+
+
+def _runs(days):
+    """Split dates into runs of consecutive days, so each run is one range scan."""
+    run = []
+    for day in sorted(days):
+        if run and day != run[-1] + timedelta(days=1):
+            yield run
+            run = []
+        run.append(day)
+    if run:
+        yield run
+
+
+def _day_range(run):
+    start = timezone.make_aware(datetime.combine(run[0], time.min))
+    end = timezone.make_aware(datetime.combine(run[-1] + timedelta(days=1), time.min))
+    return start, end
+
+
+def _status_rows(start, end):
+    rows = (
+        Order.objects
+            .filter(created_at__gte=start, created_at__lt=end)
+            .annotate(day=TruncDate("created_at"))
+            .values("day", "status")
+            .annotate(order_count=Count("id"), revenue=Sum("final_amount"), discount=Sum("discount_amount"))
+            .order_by()
+    )
+    return [DailyStatusSales(**row) for row in rows]
+
+
+def _product_rows(start, end):
+    rows = (
+        OrderItem.objects
+            .filter(order__created_at__gte=start, order__created_at__lt=end)
+            .exclude(order__status__in=UNCOUNTED_STATUSES)
+            .annotate(day=TruncDate("order__created_at"))
+            .values("day", "product_id")
+            .annotate(
+                product_name=Max("product_name"),
+                quantity=Sum("quantity"),
+                revenue=Sum("line_total"),
+                order_count=Count("order_id", distinct=True),
+            )
+            .order_by()
+    )
+    return [DailyProductSales(**row) for row in rows]
+
+
+def _category_rows(start, end):
+    rows = (
+        OrderItem.objects
+            .filter(order__created_at__gte=start, order__created_at__lt=end)
+            .exclude(order__status__in=UNCOUNTED_STATUSES)
+            .annotate(day=TruncDate("order__created_at"))
+            .values("day", "product__category_id")
+            .annotate(
+                category_name=Max("product__category__name"),
+                quantity=Sum("quantity"),
+                revenue=Sum("line_total"),
+                order_count=Count("order_id", distinct=True),
+            )
+            .order_by()
+    )
+    return [
+        DailyCategorySales(
+            day=row["day"],
+            category_id=row["product__category_id"],
+            category_name=row["category_name"],
+            quantity=row["quantity"],
+            revenue=row["revenue"],
+            order_count=row["order_count"],
+        )
+        for row in rows
+    ]
+
+
+def _coupon_rows(start, end):
+    rows = (
+        Order.objects
+            .filter(created_at__gte=start, created_at__lt=end, coupon__isnull=False)
+            .exclude(status__in=UNCOUNTED_STATUSES)
+            .annotate(day=TruncDate("created_at"))
+            .values("day", "coupon_id")
+            .annotate(
+                code=Max("coupon__code"),
+                order_count=Count("id"),
+                discount=Sum("discount_amount"),
+                revenue=Sum("final_amount"),
+            )
+            .order_by()
+    )
+    return [DailyCouponUsage(**row) for row in rows]
+
+
+def rebuild_days(days) -> None:
+    """Replace every rollup row of `days` (dates) with fresh aggregates."""
+    with transaction.atomic():
+        for run in _runs(set(days)):
+            start, end = _day_range(run)
+            for model, build in (
+                (DailyStatusSales, _status_rows),
+                (DailyProductSales, _product_rows),
+                (DailyCategorySales, _category_rows),
+                (DailyCouponUsage, _coupon_rows),
+            ):
+                model.objects.filter(day__gte=run[0], day__lte=run[-1]).delete()
+                model.objects.bulk_create(build(start, end), batch_size=1000)
+
+
+def refresh_rollups(now=None) -> int:
+    """Rebuild the days touched by orders changed since the last run; returns how many."""
+    until = (now or timezone.now()) - timedelta(seconds=SETTLE_SECONDS)
+    with transaction.atomic():
+        watermark = RollupWatermark.objects.select_for_update().order_by("pk").first()
+        changed = Order.objects.filter(updated_at__lte=until)
+        if watermark is not None:
+            if watermark.processed_until >= until:
+                return 0
+            changed = changed.filter(updated_at__gt=watermark.processed_until)
+        days = set(
+            changed
+                .annotate(day=TruncDate("created_at"))
+                .values_list("day", flat=True)
+                .order_by()
+                .distinct()
+        )
+        rebuild_days(days)
+
+        if watermark is None:
+            RollupWatermark.objects.create(processed_until=until)
+        else:
+            watermark.processed_until = until
+            watermark.save(update_fields=["processed_until", "updated_at"])
+    return len(days)
@@ -0,0 +1,61 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework import serializers
+
+# Longest range one dashboard request may cover
+MAX_RANGE_DAYS = 366
+
+
+class AnalyticsQuerySerializer(serializers.Serializer):
+    """?start / ?end (inclusive dates, default: the last 30 days) and ?limit."""
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=100, default=10)
+
+    def validate(self, attrs):
+        end = attrs.get("end") or timezone.localdate()
+        start = attrs.get("start") or end - timedelta(days=29)
+        if start > end:
+            raise serializers.ValidationError({"start": "Must not be after end."})
+        if (end - start).days >= MAX_RANGE_DAYS:
+            raise serializers.ValidationError({"start": f"Range is limited to {MAX_RANGE_DAYS} days."})
+        attrs["start"], attrs["end"] = start, end
+        return attrs
+
+
+class DailySalesSerializer(serializers.Serializer):
+    day = serializers.DateField()
+    order_count = serializers.IntegerField()
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
+    discount = serializers.DecimalField(max_digits=14, decimal_places=2)
+
+
+class StatusSalesSerializer(serializers.Serializer):
+    status = serializers.CharField()
+    order_count = serializers.IntegerField()
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
+
+
+class ProductSalesSerializer(serializers.Serializer):
+    product_id = serializers.IntegerField(allow_null=True)
+    product_name = serializers.CharField()
+    quantity = serializers.IntegerField()
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
+    order_count = serializers.IntegerField()
+
+
+class CategorySalesSerializer(serializers.Serializer):
+    category_id = serializers.IntegerField(allow_null=True)
+    category_name = serializers.CharField()
+    quantity = serializers.IntegerField()
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
+    order_count = serializers.IntegerField()
+
+
+class CouponUsageSerializer(serializers.Serializer):
+    coupon_id = serializers.IntegerField(allow_null=True)
+    code = serializers.CharField()
+    order_count = serializers.IntegerField()
+    discount = serializers.DecimalField(max_digits=14, decimal_places=2)
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
@@ -0,0 +1,8 @@
+from celery import shared_task
+
+from .rollups import refresh_rollups
+
+@shared_task
+def refresh_sales_rollups():
+    # incremental: only the days of orders changed since the previous run
+    refresh_rollups()
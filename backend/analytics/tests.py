@@ -0,0 +1,198 @@
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from coupons.models import Coupon
+from orders.models import Order, OrderItem, OrderStatus
+from orders.transitions import transition_orders
+from products.models import Category, Product
+from users.models import User
+
+from .models import DailyCategorySales, DailyCouponUsage, DailyProductSales, DailyStatusSales, RollupWatermark
+from .rollups import SETTLE_SECONDS, refresh_rollups
+
+DAY_ONE = date(2026, 3, 1)
+DAY_TWO = date(2026, 3, 2)
+
+CHECKOUT = {
+    "customer_name": "Buyer",
+    "customer_phone": "0900000000",
+    "customer_address": "1 Street",
+}
+
+
+def at_noon(day):
+    return datetime(day.year, day.month, day.day, 12, tzinfo=dt_timezone.utc)
+
+
+def settled(moment):
+    """A run time at which changes made at `moment` are past the settle window."""
+    return moment + timedelta(seconds=SETTLE_SECONDS + 1)
+
+
+def settled_write():
+    """An updated_at the next run started now will pick up."""
+    return timezone.now() - timedelta(seconds=SETTLE_SECONDS + 60)
+
+
+class RollupTests(TestCase):
+    """refresh_rollups rebuilds the days of changed orders and nothing else."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="buyer", email="buyer@example.com", password="pw")
+        cls.fruit = Category.objects.create(name="Fruit", slug="fruit")
+        cls.apple = Product.objects.create(name="Apple", price=10, category=cls.fruit, stock_quantity=50)
+        cls.coupon = Coupon.objects.create(
+            code="SALE10", discount_percent=10, min_purchase_amount=0,
+            expires_at=timezone.now() + timedelta(days=30),
+        )
+
+    def place(self, day, quantity, coupon=None, discount=0, written=None):
+        total = Decimal(10 * quantity)
+        order = Order.objects.create(
+            user=self.user, coupon=coupon, subtotal_amount=total,
+            discount_amount=discount, final_amount=total - discount, **CHECKOUT,
+        )
+        OrderItem.objects.create(
+            order=order, product=self.apple, product_name="Apple",
+            quantity=quantity, price_at_order=10, line_total=total,
+        )
+        # backdate the order, and by default its last write past the settle window
+        Order.objects.filter(pk=order.pk).update(created_at=at_noon(day), updated_at=written or settled_write())
+        return order
+
+    def rows(self):
+        return {
+            "status": sorted(DailyStatusSales.objects.values_list("day", "status", "order_count", "revenue")),
+            "product": sorted(DailyProductSales.objects.values_list("day", "product_id", "quantity", "revenue")),
+            "category": sorted(DailyCategorySales.objects.values_list("day", "category_id", "quantity", "revenue")),
+            "coupon": sorted(DailyCouponUsage.objects.values_list("day", "coupon_id", "order_count", "discount")),
+        }
+
+    def test_first_run_builds_every_day(self):
+        self.place(DAY_ONE, 2)
+        self.place(DAY_ONE, 1)
+        self.place(DAY_TWO, 3, coupon=self.coupon, discount=3)
+        now = timezone.now()
+
+        self.assertEqual(refresh_rollups(now), 2)
+
+        rows = self.rows()
+        self.assertEqual(rows["status"], [
+            (DAY_ONE, OrderStatus.PENDING, 2, Decimal("30.00")),
+            (DAY_TWO, OrderStatus.PENDING, 1, Decimal("27.00")),
+        ])
+        self.assertEqual(rows["product"], [
+            (DAY_ONE, self.apple.pk, 3, Decimal("30.00")),
+            (DAY_TWO, self.apple.pk, 3, Decimal("30.00")),
+        ])
+        self.assertEqual(rows["category"], [
+            (DAY_ONE, self.fruit.pk, 3, Decimal("30.00")),
+            (DAY_TWO, self.fruit.pk, 3, Decimal("30.00")),
+        ])
+        self.assertEqual(rows["coupon"], [(DAY_TWO, self.coupon.pk, 1, Decimal("3.00"))])
+        self.assertEqual(
+            RollupWatermark.objects.get().processed_until, now - timedelta(seconds=SETTLE_SECONDS)
+        )
+
+    def test_rerun_is_a_no_op(self):
+        self.place(DAY_ONE, 2)
+        now = timezone.now()
+        refresh_rollups(now)
+        before = self.rows()
+
+        # same run time: nothing to do at all
+        with self.assertNumQueries(3):
+            self.assertEqual(refresh_rollups(now), 0)
+        # later run time without order changes: only the watermark moves
+        later = now + timedelta(hours=1)
+        self.assertEqual(refresh_rollups(later), 0)
+        self.assertEqual(self.rows(), before)
+        self.assertEqual(
+            RollupWatermark.objects.get().processed_until, later - timedelta(seconds=SETTLE_SECONDS)
+        )
+
+    def test_orders_inside_the_settle_window_wait_for_the_next_run(self):
+        # written less than SETTLE_SECONDS before this run
+        self.place(DAY_ONE, 2, written=timezone.now())
+        self.assertEqual(refresh_rollups(timezone.now()), 0)
+        self.assertFalse(DailyStatusSales.objects.exists())
+
+        self.assertEqual(refresh_rollups(settled(timezone.now())), 1)
+        self.assertTrue(DailyStatusSales.objects.filter(day=DAY_ONE).exists())
+
+    def test_status_change_rebuilds_only_that_orders_day(self):
+        old = self.place(DAY_ONE, 2)
+        self.place(DAY_TWO, 1)
+        refresh_rollups(timezone.now())
+        day_two = list(DailyStatusSales.objects.filter(day=DAY_TWO).values_list("pk", flat=True))
+
+        transition_orders([old.pk], OrderStatus.CANCELLED, cancel_reason="CHANGED_MIND")
+        self.assertEqual(refresh_rollups(settled(timezone.now())), 1)
+
+        rows = self.rows()
+        self.assertIn((DAY_ONE, OrderStatus.CANCELLED, 1, Decimal("20.00")), rows["status"])
+        self.assertNotIn(OrderStatus.PENDING, [status for day, status, _, _ in rows["status"] if day == DAY_ONE])
+        # cancelled orders are not sales
+        self.assertEqual([row for row in rows["product"] if row[0] == DAY_ONE], [])
+        # the untouched day keeps its rows
+        self.assertEqual(list(DailyStatusSales.objects.filter(day=DAY_TWO).values_list("pk", flat=True)), day_two)
+
+    def test_incremental_runs_match_a_full_rebuild(self):
+        first = self.place(DAY_ONE, 2)
+        self.place(DAY_TWO, 4, coupon=self.coupon, discount=4)
+        refresh_rollups(timezone.now())
+        transition_orders([first.pk], OrderStatus.CONFIRMED)
+        self.place(DAY_TWO, 1, written=timezone.now())
+        refresh_rollups(settled(timezone.now()))
+        incremental = self.rows()
+
+        RollupWatermark.objects.all().delete()
+        refresh_rollups(settled(timezone.now()))
+        self.assertEqual(self.rows(), incremental)
+
+
+class AdminAnalyticsAPITests(TestCase):
+    """The dashboard endpoint reads the rollups only."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="admin", email="admin@example.com", password="pw", is_staff=True
+        )
+        DailyStatusSales.objects.bulk_create([
+            DailyStatusSales(day=DAY_ONE, status=OrderStatus.DELIVERED, order_count=2, revenue=50, discount=5),
+            DailyStatusSales(day=DAY_ONE, status=OrderStatus.CANCELLED, order_count=1, revenue=20),
+            DailyStatusSales(day=DAY_TWO, status=OrderStatus.PENDING, order_count=3, revenue=30),
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_daily_totals_leave_out_cancelled_orders(self):
+        response = self.client.get("/api/admin/analytics/", {"start": "2026-03-01", "end": "2026-03-31"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(row["day"], row["order_count"], row["revenue"]) for row in response.data["daily"]],
+            [("2026-03-01", 2, "50.00"), ("2026-03-02", 3, "30.00")],
+        )
+        self.assertEqual(
+            {row["status"]: row["order_count"] for row in response.data["by_status"]},
+            {"CANCELLED": 1, "DELIVERED": 2, "PENDING": 3},
+        )
+        self.assertIsNone(response.data["refreshed_until"])
+
+    def test_range_is_validated(self):
+        response = self.client.get("/api/admin/analytics/", {"start": "2026-03-02", "end": "2026-03-01"})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get("/api/admin/analytics/", {"start": "2024-01-01", "end": "2026-03-01"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_admins_only(self):
+        self.client.force_authenticate(User.objects.create_user(username="u", email="u@example.com", password="pw"))
+        self.assertEqual(self.client.get("/api/admin/analytics/").status_code, 403)
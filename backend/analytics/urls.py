@@ -0,0 +1,9 @@
+from django.urls import path
+
+from .views import AdminAnalyticsAPIView
+
+app_name = "analytics"
+
+urlpatterns = [
+    path("api/admin/analytics/", AdminAnalyticsAPIView.as_view(), name="admin_analytics"),
+]
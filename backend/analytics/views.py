@@ -0,0 +1,98 @@
+from django.db.models import Max, Sum
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from accounts.authentication import CookieJWTAuthentication
+
+from .models import (
+    DailyCategorySales,
+    DailyCouponUsage,
+    DailyProductSales,
+    DailyStatusSales,
+    RollupWatermark,
+)
+from .rollups import UNCOUNTED_STATUSES
+from .serializers import (
+    AnalyticsQuerySerializer,
+    CategorySalesSerializer,
+    CouponUsageSerializer,
+    DailySalesSerializer,
+    ProductSalesSerializer,
+    StatusSalesSerializer,
+)
+
+
+class AdminAnalyticsAPIView(APIView):
+    """
+    GET /api/admin/analytics/?start=YYYY-MM-DD&end=YYYY-MM-DD&limit=10
+    Sales dashboard read from the daily rollups only (see analytics/rollups.py);
+    figures lag the orders by at most one rollup run.
+    """
+    authentication_classes = [CookieJWTAuthentication, JWTAuthentication]
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    def get(self, request):
+        params = AnalyticsQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        start, end, limit = (params.validated_data[k] for k in ("start", "end", "limit"))
+        in_range = {"day__gte": start, "day__lte": end}
+
+        statuses = DailyStatusSales.objects.filter(**in_range)
+        daily = (
+            statuses.exclude(status__in=UNCOUNTED_STATUSES)
+                .values("day")
+                .annotate(order_count=Sum("order_count"), revenue=Sum("revenue"), discount=Sum("discount"))
+                .order_by("day")
+        )
+        by_status = (
+            statuses.values("status")
+                .annotate(order_count=Sum("order_count"), revenue=Sum("revenue"))
+                .order_by("status")
+        )
+        top_products = (
+            DailyProductSales.objects.filter(**in_range)
+                .values("product_id")
+                .annotate(
+                    product_name=Max("product_name"),
+                    quantity=Sum("quantity"),
+                    revenue=Sum("revenue"),
+                    order_count=Sum("order_count"),
+                )
+                .order_by("-revenue", "product_id")[:limit]
+        )
+        categories = (
+            DailyCategorySales.objects.filter(**in_range)
+                .values("category_id")
+                .annotate(
+                    category_name=Max("category_name"),
+                    quantity=Sum("quantity"),
+                    revenue=Sum("revenue"),
+                    order_count=Sum("order_count"),
+                )
+                .order_by("-revenue", "category_id")
+        )
+        coupons = (
+            DailyCouponUsage.objects.filter(**in_range)
+                .values("coupon_id")
+                .annotate(
+                    code=Max("code"),
+                    order_count=Sum("order_count"),
+                    discount=Sum("discount"),
+                    revenue=Sum("revenue"),
+                )
+                .order_by("-order_count", "coupon_id")
+        )
+        watermark = RollupWatermark.objects.order_by("pk").first()
+
+        return Response({
+            "start": start,
+            "end": end,
+            "refreshed_until": watermark.processed_until if watermark else None,
+            "daily": DailySalesSerializer(daily, many=True).data,
+            "by_status": StatusSalesSerializer(by_status, many=True).data,
+            "top_products": ProductSalesSerializer(top_products, many=True).data,
+            "categories": CategorySalesSerializer(categories, many=True).data,
+            "coupons": CouponUsageSerializer(coupons, many=True).data,
+        })
@@ -0,0 +1,126 @@
+# backend/cache.py
+"""
+Versioned response cache for public read endpoints.
+
+Each model has a version counter in the shared cache. Cached responses are
+keyed on the view, the host and path, the normalized query string and the
+current versions of the models the view depends on, so bumping a counter
+(on save/delete, see `bump_model_version`) invalidates every dependent
+response in O(1) without scanning keys. The same key doubles as the ETag,
+which lets unchanged resources answer `If-None-Match` with a 304 before the
+view runs.
+
+Counters only invalidate across workers when the cache is shared between
+them (settings.CACHE_SHARED); otherwise `shared_cache_enabled()` is False and
+every version-keyed cache is bypassed.
+"""
+from __future__ import annotations
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+VERSION_KEY_PREFIX = "respcache:version:"
+RESPONSE_KEY_PREFIX = "respcache:response:"
+
+
+def shared_cache_enabled() -> bool:
+    """Whether the configured cache (and so the version counters) is shared by all workers."""
+    return getattr(settings, "CACHE_SHARED", False)
+
+
+def _label(model) -> str:
+    return model if isinstance(model, str) else model._meta.label_lower
+
+
+def _version_key(model) -> str:
+    return VERSION_KEY_PREFIX + _label(model)
+
+
+def _initial_version() -> int:
+    # Never restart at 1 after an eviction, or old responses would match again
+    return int(time.time() * 1000)
+
+
+def get_model_versions(models) -> list[int]:
+    keys = [_version_key(model) for model in models]
+    found = cache.get_many(keys)
+    versions = []
+    for key in keys:
+        version = found.get(key)
+        if version is None:
+            cache.add(key, _initial_version(), timeout=None)
+            version = cache.get(key)
+        versions.append(version)
+    return versions
+
+
+def bump_model_version(model) -> None:
+    key = _version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _initial_version(), timeout=None)
+
+
+def bump_version_on_change(sender, **kwargs):
+    """post_save / post_delete receiver."""
+    bump_model_version(sender)
+
+
+def normalized_query(request) -> str:
+    items = sorted(
+        (key, value)
+        for key, values in request.query_params.lists()
+        for value in values
+        if value != ""
+    )
+    return urlencode(items)
+
+
+class CachedResponseMixin:
+    """
+    Cache successful GET responses of a public (not per-user) view.
+    `response_cache_models` lists every model whose changes affect the output.
+    """
+    response_cache_models = ()
+
+    def get_response_cache_key(self, request, **kwargs) -> str:
+        versions = get_model_versions(self.response_cache_models)
+        raw = "|".join([
+            type(self).__name__,
+            request.get_host(),
+            request.path,
+            normalized_query(request),
+            ",".join(str(v) for v in versions),
+        ])
+        return hashlib.md5(raw.encode()).hexdigest()
+
+    def get(self, request, *args, **kwargs):
+        if not shared_cache_enabled():
+            return super().get(request, *args, **kwargs)
+        key = self.get_response_cache_key(request, **kwargs)
+        etag = f'"{key}"'
+
+        if_none_match = request.headers.get("If-None-Match", "").strip()
+        if etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        data = cache.get(RESPONSE_KEY_PREFIX + key)
+        if data is None:
+            response = super().get(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            data = response.data
+            cache.set(RESPONSE_KEY_PREFIX + key, data, getattr(settings, "RESPONSE_CACHE_TIMEOUT", 60 * 15))
+        else:
+            response = Response(data)
+        if if_none_match == "*":
+            # "*" matches any current representation, so only once the view found one
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        response["ETag"] = etag
+        return response
@@ -11,6 +11,22 @@ app.autodiscover_tasks()
 app.conf.beat_schedule = {
     'update-expired-coupons': {
         'task': 'coupons.tasks.update_expired_coupons',
-        'schedule': crontab(minute=0, hour='*'),  # Chạy mỗi giờ
+        'schedule': crontab(minute='*/5'),  # Chạy mỗi 5 phút (chỉ coupon vừa hết hạn)
+    },
+    'refresh-product-facets': {
+        'task': 'products.tasks.refresh_product_facets',
+        'schedule': crontab(minute='*/15'),
+    },
+    'release-expired-cart-reservations': {
+        'task': 'carts.tasks.release_expired_reservations',
+        'schedule': crontab(),  # every minute
+    },
+    'purge-idempotency-keys': {
+        'task': 'orders.tasks.purge_idempotency_keys',
+        'schedule': crontab(minute=30, hour='*'),
+    },
+    'refresh-sales-rollups': {
+        'task': 'analytics.tasks.refresh_sales_rollups',
+        'schedule': crontab(minute='*/10'),
     },
 }
\ No newline at end of file
@@ -0,0 +1,176 @@
+# backend/pagination.py
+"""
+Opt-in keyset (cursor) pagination.
+
+`CursorModePaginationMixin` is combined with a PageNumberPagination subclass:
+requests without `?cursor=` keep the usual page-number behaviour, while
+`?cursor=` (empty for the first page) switches to keyset pagination over the
+queryset's own ordering plus the primary key as a tie-breaker. Keyset pages
+never run a COUNT(*), cost the same at any depth and do not shift when rows
+are inserted concurrently.
+"""
+from __future__ import annotations
+import base64
+import binascii
+import datetime
+import decimal
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPaginator:
+    """Paginates an ordered queryset by the values of its ordering fields."""
+
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self, page_size, cursor_query_param="cursor",
+                 allowed_fields=None, default_ordering=("-created_at",)):
+        self.page_size = page_size
+        self.cursor_query_param = cursor_query_param
+        self.allowed_fields = allowed_fields
+        self.default_ordering = default_ordering
+
+    # -------- ordering --------
+    def get_keys(self, queryset):
+        """[(field, descending), ...] ending with the primary key."""
+        ordering = list(queryset.query.order_by) or list(queryset.model._meta.ordering)
+        if not self._is_keyset_ordering(ordering):
+            ordering = list(self.default_ordering)
+        keys = []
+        for item in ordering:
+            field = item.lstrip("-")
+            keys.append(("pk" if field == "id" else field, item.startswith("-")))
+        if not any(field == "pk" for field, _ in keys):
+            keys.append(("pk", keys[0][1] if keys else True))
+        return keys
+
+    def _is_keyset_ordering(self, ordering):
+        if not ordering:
+            return False
+        for item in ordering:
+            if not isinstance(item, str) or "__" in item or item == "?":
+                return False
+            field = item.lstrip("-")
+            if self.allowed_fields is not None and field not in self.allowed_fields and field not in ("id", "pk"):
+                return False
+        return True
+
+    # -------- cursor encoding --------
+    @staticmethod
+    def _encode_value(value):
+        if isinstance(value, (datetime.datetime, datetime.date)):
+            return value.isoformat()
+        if isinstance(value, decimal.Decimal):
+            return str(value)
+        return value
+
+    def encode_cursor(self, values, reverse=False):
+        payload = json.dumps({"v": [self._encode_value(v) for v in values], "r": int(reverse)})
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, encoded, key_count):
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            values, reverse = payload["v"], bool(payload.get("r"))
+        except (TypeError, ValueError, KeyError, binascii.Error, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != key_count:
+            raise NotFound(self.invalid_cursor_message)
+        return values, reverse
+
+    # -------- pagination --------
+    @staticmethod
+    def _beyond(keys, values, reverse):
+        """Rows strictly after (or before, when reversed) the cursor position."""
+        condition = Q()
+        for i, (field, descending) in enumerate(keys):
+            if reverse:
+                descending = not descending
+            step = Q(**{f"{field}__{'lt' if descending else 'gt'}": values[i]})
+            for j, (previous_field, _) in enumerate(keys[:i]):
+                step &= Q(**{previous_field: values[j]})
+            condition |= step
+        return condition
+
+    def paginate_queryset(self, queryset, request):
+        self.request = request
+        keys = self.get_keys(queryset)
+        values, reverse = self.decode_cursor(request.query_params.get(self.cursor_query_param), len(keys))
+
+        order_by = [
+            ("-" if descending != reverse else "") + field
+            for field, descending in keys
+        ]
+        queryset = queryset.order_by(*order_by)
+        try:
+            if values is not None:
+                queryset = queryset.filter(self._beyond(keys, values, reverse))
+            rows = list(queryset[:self.page_size + 1])
+        except (ValidationError, TypeError, ValueError):
+            # well-formed cursor carrying values the key fields cannot take
+            raise NotFound(self.invalid_cursor_message)
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        def position(obj):
+            return [getattr(obj, field) for field, _ in keys]
+
+        self.next_cursor = self.previous_cursor = None
+        if rows:
+            if has_more or reverse:
+                self.next_cursor = self.encode_cursor(position(rows[-1]))
+            if (has_more and reverse) or (values is not None and not reverse):
+                self.previous_cursor = self.encode_cursor(position(rows[0]), reverse=True)
+        return rows
+
+    def _link(self, cursor):
+        if cursor is None:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), "page")
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self._link(self.next_cursor),
+            "previous": self._link(self.previous_cursor),
+            "results": data,
+        })
+
+
+class CursorModePaginationMixin:
+    """
+    Add an opt-in `?cursor=` keyset mode to a PageNumberPagination subclass.
+    `cursor_fields` lists the ordering fields that may be used as keys; any
+    other ordering falls back to `cursor_default_ordering`.
+    """
+    cursor_query_param = "cursor"
+    cursor_page_size = 20
+    cursor_fields = ("created_at",)
+    cursor_default_ordering = ("-created_at",)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.cursor_query_param not in request.query_params:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.keyset = KeysetPaginator(
+            page_size=self.get_page_size(request) or self.cursor_page_size,
+            cursor_query_param=self.cursor_query_param,
+            allowed_fields=self.cursor_fields,
+            default_ordering=self.cursor_default_ordering,
+        )
+        return self.keyset.paginate_queryset(queryset, request)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
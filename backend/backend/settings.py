@@ -58,6 +58,7 @@ INSTALLED_APPS = [
     'orders',
     'corsheaders',
     'coupons',
+    'analytics',
 ]
 
 MIDDLEWARE = [
@@ -129,6 +130,43 @@ DATABASES = {
 }
 
 
+# Cache
+# A shared Redis cache in production (REDIS_URL); per-process memory otherwise.
+# CACHE_SHARED tells backend/cache.py whether a version bump in one worker is
+# seen by the others: without it the response cache and the in-process
+# category / coupon maps stay off rather than serve stale data (gunicorn runs
+# several workers). A single-process setup (tests) may turn it on explicitly.
+
+CACHE_SHARED = bool(os.getenv('REDIS_URL'))
+
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+    }
+
+# Seconds a cached public API response is kept (see backend/cache.py)
+RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', 60 * 15))
+
+# Seconds a cart line holds its stock (see carts/reservations.py); 0 disables
+CART_RESERVATION_SECONDS = int(os.getenv('CART_RESERVATION_SECONDS', 0))
+
+# Seconds the per-user cart summary badge may be cached (see carts/services.py);
+# optional (0, the default, disables it), and needs CACHE_SHARED
+CART_SUMMARY_CACHE_TIMEOUT = int(os.getenv('CART_SUMMARY_CACHE_TIMEOUT', 0))
+
+# Hours an order Idempotency-Key is remembered (see orders/idempotency.py)
+IDEMPOTENCY_KEY_TTL_HOURS = int(os.getenv('IDEMPOTENCY_KEY_TTL_HOURS', 24))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -0,0 +1,103 @@
+# backend/slugs.py
+"""
+Unique slug allocation shared by Product, Category and Blog.
+
+All existing slugs that could collide with a base slug are fetched with one
+prefix query and the first free suffix is picked in memory, for one value
+or a whole batch. `UniqueSlugMixin.save` then inserts inside a savepoint and
+retries with a fresh allocation if a concurrent insert took the slug first,
+so the unique constraint (not a check-then-insert race) is the final word.
+"""
+from __future__ import annotations
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils.text import slugify
+
+# Characters kept free for a "-<n>" suffix when a base is truncated
+SUFFIX_RESERVE = 10
+SAVE_ATTEMPTS = 5
+
+
+def slug_base(value, max_length: int, fallback: str) -> str:
+    return slugify(value or "")[:max_length].rstrip("-") or fallback
+
+
+def _candidate(base: str, n: int, max_length: int) -> str:
+    suffix = f"-{n}"
+    return base[:max_length - len(suffix)].rstrip("-") + suffix
+
+
+def _prefix(base: str, max_length: int) -> str:
+    # suffixed candidates of a long base are truncated, so match on a shorter prefix
+    return base[:max_length - SUFFIX_RESERVE] if len(base) > max_length - SUFFIX_RESERVE else base
+
+
+def allocate_slugs(model, values, *, slug_field="slug", fallback="item",
+                   first_suffix=1, exclude_pk=None, taken=()) -> list[str]:
+    """
+    Unique slugs for `values` (in order), with a single query for the batch.
+    `taken` lists slugs to avoid in addition to the stored ones.
+    """
+    max_length = model._meta.get_field(slug_field).max_length
+    bases = [slug_base(value, max_length, fallback) for value in values]
+    used = set(taken)
+    if bases:
+        condition = Q()
+        for prefix in {_prefix(base, max_length) for base in bases}:
+            condition |= Q(**{f"{slug_field}__startswith": prefix})
+        existing = model._base_manager.filter(condition)
+        if exclude_pk is not None:
+            existing = existing.exclude(pk=exclude_pk)
+        used.update(existing.order_by().values_list(slug_field, flat=True))
+
+    slugs = []
+    for base in bases:
+        candidate, n = base, first_suffix
+        while candidate in used:
+            candidate = _candidate(base, n, max_length)
+            n += 1
+        used.add(candidate)
+        slugs.append(candidate)
+    return slugs
+
+
+class UniqueSlugMixin:
+    """
+    Model mixin filling a blank `slug` from `slug_source_field` on save.
+    Subclasses may set `slug_fallback` (used when the source slugifies to
+    nothing) and `slug_first_suffix` (first number tried on collision).
+    """
+    slug_source_field = "name"
+    slug_fallback = "item"
+    slug_first_suffix = 1
+
+    def allocate_slug(self) -> str:
+        return allocate_slugs(
+            type(self),
+            [getattr(self, self.slug_source_field)],
+            fallback=self.slug_fallback,
+            first_suffix=self.slug_first_suffix,
+            exclude_pk=self.pk,
+        )[0]
+
+    def save(self, *args, **kwargs):
+        if self.slug and str(self.slug).strip():
+            return super().save(*args, **kwargs)
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = set(kwargs["update_fields"]) | {"slug"}
+
+        for attempt in range(SAVE_ATTEMPTS):
+            self.slug = self.allocate_slug()
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                taken = (
+                    type(self)._base_manager
+                        .filter(slug=self.slug)
+                        .exclude(pk=self.pk)
+                        .exists()
+                )
+                if not taken or attempt == SAVE_ATTEMPTS - 1:
+                    raise
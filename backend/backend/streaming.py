@@ -0,0 +1,90 @@
+# backend/streaming.py
+"""
+Helpers for streaming exports and imports.
+
+Exports are written row by row into a StreamingHttpResponse so a large
+table is never materialized in memory; imports read an uploaded file line
+by line in the same spirit.
+"""
+from __future__ import annotations
+import codecs
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson; charset=utf-8",
+}
+
+
+# Spreadsheets evaluate cells starting with these as formulas (CSV injection)
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def escape_cell(value):
+    """Prefix text that a spreadsheet would run as a formula with a quote."""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def unescape_cell(value: str) -> str:
+    """Undo `escape_cell`, so exported CSV files import back unchanged."""
+    if value.startswith("'") and value[1:].startswith(FORMULA_PREFIXES):
+        return value[1:]
+    return value
+
+
+class Echo:
+    """File-like object whose write() just returns the value (for csv.writer)."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(header, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow([escape_cell(value) for value in row])
+
+
+def jsonl_lines(header, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(header, row)), cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
+
+
+def streaming_export(header, rows, export_type: str, filename: str) -> StreamingHttpResponse:
+    """Stream `rows` (tuples matching `header`) as a CSV or JSONL download."""
+    lines = csv_lines(header, rows) if export_type == "csv" else jsonl_lines(header, rows)
+    response = StreamingHttpResponse(lines, content_type=CONTENT_TYPES[export_type])
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{export_type}"'
+    return response
+
+
+def iter_records(fileobj, import_type: str):
+    """
+    Yield (line number, dict) for each record of a CSV or JSONL byte stream.
+    Malformed JSON lines yield (line number, None).
+    """
+    lines = codecs.iterdecode(fileobj, "utf-8-sig")
+    if import_type == "csv":
+        reader = csv.DictReader(lines)
+        for record in reader:
+            yield reader.line_num, {
+                key.strip(): unescape_cell(value) for key, value in record.items()
+                if key and value not in ("", None)
+            }
+        return
+
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        yield line_number, record if isinstance(record, dict) else None
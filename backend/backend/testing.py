@@ -0,0 +1,33 @@
+# backend/testing.py
+"""Helpers shared by the apps' test modules."""
+from __future__ import annotations
+import threading
+
+from django.db import connection
+
+
+def run_concurrently(target, args_list, timeout=30):
+    """
+    Call `target(*args)` for every args tuple, each in its own thread (and so
+    its own database connection), released together by a barrier. Returns
+    the results in order; an exception raised in a thread is returned in
+    place of its result so the test can assert on it.
+    """
+    barrier = threading.Barrier(len(args_list))
+    results = [None] * len(args_list)
+
+    def run(index, args):
+        try:
+            barrier.wait(timeout)
+            results[index] = target(*args)
+        except Exception as exc:  # reported to the caller
+            results[index] = exc
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=run, args=(i, args)) for i, args in enumerate(args_list)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout)
+    return results
@@ -33,4 +33,5 @@ urlpatterns = [
     path("", include("orders.urls")),
     path("", include("coupons.urls")),
     path("", include("carts.urls")),
+    path("", include("analytics.urls")),
 ]
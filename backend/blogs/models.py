@@ -1,30 +1,18 @@
 # apps/blog/models.py
 from django.db import models
 from django.urls import reverse
-from django.utils.text import slugify, Truncator
+from django.utils.text import Truncator
 from django.utils.html import strip_tags
 from django.conf import settings
-
-
-# -------- helpers --------
-def unique_slugify(instance, value, slug_field_name="slug", max_length=255):
-    """
-    Create a unique slug from `value` for the given model instance.
-    Appends -2, -3, ... if needed. Trims to `max_length`.
-    """
-    base = slugify(value)[:max_length].rstrip("-")
-    slug = base or "post"
-    Model = instance.__class__
-    n = 2
-    while Model.objects.filter(**{slug_field_name: slug}).exclude(pk=instance.pk).exists():
-        suffix = f"-{n}"
-        slug = (base[: max_length - len(suffix)] + suffix).rstrip("-")
-        n += 1
-    return slug
+from backend.slugs import UniqueSlugMixin
 
 
 # -------- blog --------
-class Blog(models.Model):
+class Blog(UniqueSlugMixin, models.Model):
+    slug_source_field = "title"
+    slug_fallback = "post"
+    slug_first_suffix = 2
+
     title = models.CharField(max_length=255)
     slug = models.SlugField(max_length=255, unique=True, blank=True, db_index=True)
     meta_description = models.CharField(max_length=160, blank=True)  # SEO snippet
@@ -51,11 +39,6 @@ class Blog(models.Model):
         ]
         ordering = ["-created_at"]
 
-    def save(self, *args, **kwargs):
-        if not self.slug and self.title:
-            self.slug = unique_slugify(self, self.title)
-        super().save(*args, **kwargs)
-
     def __str__(self):
         return self.title
 
@@ -0,0 +1,8 @@
+# blogs/signals.py
+from django.db.models.signals import post_delete, post_save
+
+from backend.cache import bump_version_on_change
+from .models import Blog
+
+post_save.connect(bump_version_on_change, sender=Blog)
+post_delete.connect(bump_version_on_change, sender=Blog)
@@ -2,18 +2,22 @@ from rest_framework import generics, filters
 from rest_framework.permissions import AllowAny, IsAuthenticated, IsAdminUser
 from rest_framework.pagination import PageNumberPagination
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from backend.cache import CachedResponseMixin
+from backend.pagination import CursorModePaginationMixin
+from products.models import Product
 
 from .models import Blog
 from .serializers import BlogListSerializer, BlogDetailSerializer, BlogListSerializer
 
-class BlogPagination(PageNumberPagination):
+class BlogPagination(CursorModePaginationMixin, PageNumberPagination):
     page_size = 10
     page_size_query_param = "page_size"
     max_page_size = 50
+    cursor_fields = ("created_at", "updated_at", "title")
 
 
 # -------- Public endpoints (read-only) --------
-class PublicBlogListAPIView(generics.ListAPIView):
+class PublicBlogListAPIView(CachedResponseMixin, generics.ListAPIView):
     """
     GET /api/blogs/?search=...&ordering=-created_at&page=1&page_size=12
     """
@@ -21,6 +25,7 @@ class PublicBlogListAPIView(generics.ListAPIView):
     serializer_class = BlogListSerializer
     permission_classes = [AllowAny]
     pagination_class = BlogPagination
+    response_cache_models = (Blog,)
 
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ["title", "excerpt", "content"]
@@ -28,7 +33,7 @@ class PublicBlogListAPIView(generics.ListAPIView):
     ordering = ["-created_at"]
 
 
-class PublicBlogDetailAPIView(generics.RetrieveAPIView):
+class PublicBlogDetailAPIView(CachedResponseMixin, generics.RetrieveAPIView):
     """
     GET /api/blogs/<slug:slug>/
     """
@@ -36,6 +41,7 @@ class PublicBlogDetailAPIView(generics.RetrieveAPIView):
     serializer_class = BlogDetailSerializer
     permission_classes = [AllowAny]
     lookup_field = "slug"
+    response_cache_models = (Blog, Product)  # embeds the related product card
 
 
 # -------- Admin endpoints (CRUD) --------
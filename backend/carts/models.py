@@ -41,6 +41,10 @@ class CartItem(models.Model):
         default=1,
         validators=[MinValueValidator(1)]
     )
+    # Stock held for this line while cart reservations are enabled
+    # (settings.CART_RESERVATION_SECONDS); see carts/reservations.py
+    reserved_quantity = models.PositiveIntegerField(default=0, editable=False)
+    reserved_until = models.DateTimeField(null=True, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -50,6 +54,7 @@ class CartItem(models.Model):
         indexes = [
             models.Index(fields=['cart'], name='idx_cartitem_cart'),
             models.Index(fields=['product'], name='idx_cartitem_product'),
+            models.Index(fields=['reserved_until'], name='idx_cartitem_reserved_until'),
         ]
 
     def __str__(self):
@@ -0,0 +1,81 @@
+# carts/reservations.py
+"""
+Optional short-lived stock reservations for cart lines.
+
+With settings.CART_RESERVATION_SECONDS > 0, adding or changing a cart line
+takes the difference out of stock right away (products/stock.py) and keeps
+it until the line is removed, checked out or its reservation expires; the
+`release_expired_reservations` task gives expired holds back. With the
+setting at 0 (default) carts hold nothing and stock is only taken at
+checkout.
+"""
+from __future__ import annotations
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from products.stock import adjust_stock, release_stock
+
+
+def reservation_seconds() -> int:
+    return getattr(settings, "CART_RESERVATION_SECONDS", 0)
+
+
+def hold(item, quantity: int) -> None:
+    """
+    Make `item`'s reservation cover `quantity` (caller saves the item).
+    Raises products.stock.InsufficientStock if the stock is not there.
+    """
+    hold_all([(item, quantity)])
+
+
+def hold_all(pairs) -> None:
+    """`hold` for several (item, quantity) pairs with one reserve and one release."""
+    seconds = reservation_seconds()
+    if not seconds:
+        return
+    take, give = {}, {}
+    for item, quantity in pairs:
+        delta = quantity - item.reserved_quantity
+        if delta > 0:
+            take[item.product_id] = take.get(item.product_id, 0) + delta
+        elif delta < 0:
+            give[item.product_id] = give.get(item.product_id, 0) - delta
+    adjust_stock(take, give)
+    until = timezone.now() + timedelta(seconds=seconds)
+    for item, quantity in pairs:
+        item.reserved_quantity = quantity
+        item.reserved_until = until
+
+
+def release_items(items) -> None:
+    """Give back the stock held by cart lines that are about to be deleted."""
+    quantities = {}
+    for item in items:
+        if item.reserved_quantity:
+            quantities[item.product_id] = quantities.get(item.product_id, 0) + item.reserved_quantity
+    release_stock(quantities)
+
+
+def release_expired_reservations(batch_size: int = 500) -> int:
+    """Release expired holds in batches; returns the number of cart lines released."""
+    from .models import CartItem
+
+    released = 0
+    while True:
+        with transaction.atomic():
+            items = list(
+                CartItem.objects
+                    .select_for_update(skip_locked=True)
+                    .filter(reserved_quantity__gt=0, reserved_until__lt=timezone.now())
+                    .order_by("reserved_until")[:batch_size]
+            )
+            if not items:
+                return released
+            release_items(items)
+            CartItem.objects.filter(pk__in=[item.pk for item in items]).update(
+                reserved_quantity=0, reserved_until=None,
+            )
+        released += len(items)
@@ -1,3 +1,4 @@
+from decimal import Decimal
 from rest_framework import serializers
 from .models import Cart, CartItem
 from products.models import Product
@@ -6,39 +7,17 @@ from products.models import Product
 class CartItemProductSerializer(serializers.Serializer):
     """
     Safe product representation for cart responses.
-    Uses a plain Serializer (not ModelSerializer) to avoid DRF complaining
-    if the Product model lacks optional fields like `primary_image`.
+    Uses a plain Serializer (not ModelSerializer) to keep the cart payload
+    independent of the Product model's field list.
     """
     id = serializers.IntegerField()
     slug = serializers.CharField()
     name = serializers.CharField()
     price = serializers.DecimalField(max_digits=12, decimal_places=2)
-    primary_image = serializers.SerializerMethodField()
+    primary_image = serializers.CharField(source='primary_image_url', allow_null=True)
     is_in_stock = serializers.BooleanField()
     stock_quantity = serializers.IntegerField(allow_null=True)
 
-    def get_primary_image(self, obj: Product):
-        if hasattr(obj, "primary_image") and obj.primary_image:
-            try:
-                return getattr(obj.primary_image, "url", str(obj.primary_image))
-            except Exception:
-                return str(obj.primary_image)
-
-        if hasattr(obj, "images"):
-            try:
-                first = obj.images.all().first()
-                if first:
-                    return getattr(first, "image_url", None) or getattr(first, "image", None) or getattr(first, "file", None) or None
-            except Exception:
-                pass
-
-        for attr in ("primary_image_url", "image_url", "image"):
-            if hasattr(obj, attr):
-                val = getattr(obj, attr)
-                if val:
-                    return getattr(val, "url", str(val)) if hasattr(val, "url") else str(val)
-
-        return None
 
 class CartItemSerializer(serializers.ModelSerializer):
     """Cart item with product details"""
@@ -50,11 +29,16 @@ class CartItemSerializer(serializers.ModelSerializer):
         fields = ['id', 'product', 'quantity', 'subtotal', 'created_at']
 
     def get_subtotal(self, obj):
-        return float(obj.product.price) * obj.quantity
+        # Decimal, rendered as a JSON number
+        return obj.product.price * obj.quantity
 
 
 class CartSerializer(serializers.ModelSerializer):
-    """Full cart with items and totals"""
+    """
+    Full cart with items and totals. Serialize carts from
+    carts.services.cart_with_items() so items and products come prefetched
+    (two queries in total); totals are computed once, in Decimal.
+    """
     items = CartItemSerializer(many=True, read_only=True)
     total_items = serializers.SerializerMethodField()
     total_price = serializers.SerializerMethodField()
@@ -63,11 +47,20 @@ class CartSerializer(serializers.ModelSerializer):
         model = Cart
         fields = ['id', 'items', 'total_items', 'total_price', 'updated_at']
 
+    def _totals(self, obj):
+        if not hasattr(obj, '_cart_totals'):
+            items = obj.items.all()
+            obj._cart_totals = (
+                sum(item.quantity for item in items),
+                sum((item.product.price * item.quantity for item in items), Decimal('0.00')),
+            )
+        return obj._cart_totals
+
     def get_total_items(self, obj):
-        return sum(item.quantity for item in obj.items.all())
+        return self._totals(obj)[0]
 
     def get_total_price(self, obj):
-        return sum(float(item.product.price) * item.quantity for item in obj.items.all())
+        return self._totals(obj)[1]
 
 
 class AddToCartSerializer(serializers.Serializer):
@@ -85,3 +78,24 @@ class UpdateCartItemSerializer(serializers.Serializer):
 class RemoveFromCartSerializer(serializers.Serializer):
     """Remove product from cart"""
     product_id = serializers.IntegerField()
+
+
+class CartOperationSerializer(serializers.Serializer):
+    """One operation of a batch cart update"""
+    ADD, SET, REMOVE = 'add', 'set', 'remove'
+
+    op = serializers.ChoiceField(choices=[ADD, SET, REMOVE])
+    product_id = serializers.IntegerField()
+    quantity = serializers.IntegerField(required=False, min_value=1)
+
+    def validate(self, attrs):
+        if attrs['op'] != self.REMOVE and 'quantity' not in attrs:
+            raise serializers.ValidationError({'quantity': 'This field is required.'})
+        return attrs
+
+
+class CartBatchSerializer(serializers.Serializer):
+    """Apply several cart operations at once (e.g. merging a guest cart)"""
+    operations = serializers.ListField(
+        child=CartOperationSerializer(), min_length=1, max_length=100,
+    )
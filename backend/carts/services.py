@@ -0,0 +1,175 @@
+# carts/services.py
+"""Shared cart read helpers."""
+from __future__ import annotations
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import DecimalField, F, Prefetch, Sum, prefetch_related_objects
+
+from backend.cache import shared_cache_enabled
+
+from .models import Cart, CartItem
+from .serializers import CartSerializer
+
+
+def cart_items_prefetch() -> Prefetch:
+    return Prefetch(
+        'items',
+        queryset=CartItem.objects.select_related('product').order_by('created_at', 'id'),
+    )
+
+
+def cart_with_items(user=None, cart=None) -> Cart:
+    """The user's cart (created if missing) with items and products prefetched."""
+    if cart is None:
+        cart, _ = Cart.objects.get_or_create(user=user)
+    else:
+        # drop results prefetched before a mutation
+        cart._prefetched_objects_cache = {}
+        cart.__dict__.pop('_cart_totals', None)
+    prefetch_related_objects([cart], cart_items_prefetch())
+    return cart
+
+
+def serialize_cart(user=None, cart=None) -> dict:
+    return CartSerializer(cart_with_items(user=user, cart=cart)).data
+
+
+# -------- summary (header badge) --------
+SUMMARY_KEY_PREFIX = "cart:summary:"
+
+
+def _summary_key(user_id) -> str:
+    return f"{SUMMARY_KEY_PREFIX}{user_id}"
+
+
+def cart_summary(user, cached=True) -> dict:
+    """
+    Total quantity and exact Decimal price of the user's cart from one
+    aggregate query. With settings.CART_SUMMARY_CACHE_TIMEOUT > 0 (and a
+    shared cache) the header badge may be served from a per-user cache entry
+    that cart mutations drop; product price changes do not, so the cached
+    total can lag a price edit by up to the timeout. Pass cached=False
+    wherever money is computed from the total.
+    """
+    timeout = getattr(settings, "CART_SUMMARY_CACHE_TIMEOUT", 0) if cached else 0
+    if not shared_cache_enabled():
+        # another worker's invalidation would never reach a per-process cache
+        timeout = 0
+    key = _summary_key(user.pk)
+    if timeout:
+        summary = cache.get(key)
+        if summary is not None:
+            return summary
+
+    totals = CartItem.objects.filter(cart__user=user).aggregate(
+        total_items=Sum("quantity"),
+        total_price=Sum(
+            F("quantity") * F("product__price"),
+            output_field=DecimalField(max_digits=14, decimal_places=2),
+        ),
+    )
+    summary = {
+        "total_items": totals["total_items"] or 0,
+        "total_price": totals["total_price"] or Decimal("0.00"),
+    }
+    if timeout:
+        cache.set(key, summary, timeout)
+    return summary
+
+
+def invalidate_cart_summary(user_id) -> None:
+    """Drop the cached summary once the current transaction commits."""
+    transaction.on_commit(lambda: cache.delete(_summary_key(user_id)))
+
+
+# -------- batch mutations --------
+class CartBatchError(Exception):
+    def __init__(self, items):
+        super().__init__("Cart batch rejected")
+        # [{"product_id", "error", ...}]
+        self.items = items
+
+
+def apply_cart_operations(cart, operations) -> None:
+    """
+    Apply add/set/remove operations (validated CartOperationSerializer data,
+    in order) to `cart` in one transaction: existing lines are locked and read
+    with one query, stock is checked with one query, and the result is written
+    with one bulk upsert plus one delete. Raises CartBatchError with every
+    failing product and changes nothing.
+    """
+    from products.models import Product
+    from products.stock import InsufficientStock
+    from .reservations import hold_all, release_items
+    from .serializers import CartOperationSerializer as Op
+
+    product_ids = {operation["product_id"] for operation in operations}
+    with transaction.atomic():
+        existing = {
+            item.product_id: item
+            for item in CartItem.objects.select_for_update().filter(cart=cart, product_id__in=product_ids)
+        }
+        quantities = {pk: item.quantity for pk, item in existing.items()}
+        for operation in operations:
+            pk = operation["product_id"]
+            if operation["op"] == Op.ADD:
+                quantities[pk] = quantities.get(pk, 0) + operation["quantity"]
+            elif operation["op"] == Op.SET:
+                quantities[pk] = operation["quantity"]
+            else:
+                quantities[pk] = 0
+
+        wanted = {pk: qty for pk, qty in quantities.items() if qty > 0}
+        stock = {
+            pk: (stock_quantity, is_in_stock)
+            for pk, stock_quantity, is_in_stock in Product.objects
+                .filter(pk__in=wanted, is_deleted=False)
+                .values_list("pk", "stock_quantity", "is_in_stock")
+        }
+        errors = []
+        for pk, qty in sorted(wanted.items()):
+            if pk not in stock:
+                errors.append({"product_id": pk, "error": "Product not found"})
+                continue
+            held = existing[pk].reserved_quantity if pk in existing else 0
+            stock_quantity, is_in_stock = stock[pk]
+            if (not is_in_stock and not held) or stock_quantity + held < qty:
+                errors.append({
+                    "product_id": pk, "error": "Insufficient stock",
+                    "requested": qty, "available": stock_quantity + held,
+                })
+        if errors:
+            raise CartBatchError(errors)
+
+        # fresh rows (no pk) so the upsert conflicts on (cart, product)
+        upserts = [
+            CartItem(
+                cart=cart, product_id=pk,
+                reserved_quantity=existing[pk].reserved_quantity if pk in existing else 0,
+                reserved_until=existing[pk].reserved_until if pk in existing else None,
+            )
+            for pk in wanted
+        ]
+        removed = [item for pk, item in existing.items() if pk not in wanted]
+        try:
+            hold_all([(item, wanted[item.product_id]) for item in upserts])
+        except InsufficientStock as exc:
+            raise CartBatchError([{**item, "error": "Insufficient stock"} for item in exc.items])
+        release_items(removed)
+
+        for item in upserts:
+            item.quantity = wanted[item.product_id]
+        CartItem.objects.bulk_create(
+            upserts,
+            update_conflicts=True,
+            unique_fields=["cart", "product"],
+            update_fields=["quantity", "reserved_quantity", "reserved_until", "updated_at"],
+        )
+        if removed:
+            CartItem.objects.filter(pk__in=[item.pk for item in removed]).delete()
+        # the cart's updated_at reflects the latest change
+        cart.save(update_fields=["updated_at"])
+    invalidate_cart_summary(cart.user_id)
@@ -0,0 +1,7 @@
+from celery import shared_task
+
+from .reservations import release_expired_reservations as release_expired
+
+@shared_task
+def release_expired_reservations():
+    release_expired()
@@ -1,3 +1,88 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from products.models import Category, Product
+from users.models import User
+
+from .models import Cart, CartItem
+from .services import serialize_cart
+
+CART_SIZES = (1, 5, 20)
+
+
+class CartQueryCountTests(TestCase):
+    """Reading a cart costs two queries (cart + items with products) at any size."""
+
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(name="Fruit", slug="fruit")
+        cls.products = [
+            Product.objects.create(name=f"Product {i}", price=10, category=category, stock_quantity=100)
+            for i in range(max(CART_SIZES) + 1)
+        ]
+        cls.spare = cls.products.pop()
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="buyer", email="buyer@example.com", password="pw")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def fill_cart(self, size):
+        cart, _ = Cart.objects.get_or_create(user=self.user)
+        cart.items.all().delete()
+        CartItem.objects.bulk_create(
+            CartItem(cart=cart, product=product, quantity=1) for product in self.products[:size]
+        )
+        return cart
+
+    def count_queries(self, method, path, data=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(path, data, format="json")
+        self.assertLess(response.status_code, 300, response.data)
+        return len(queries), response.data
+
+    def test_get_cart(self):
+        for size in CART_SIZES:
+            with self.subTest(size=size):
+                self.fill_cart(size)
+                with self.assertNumQueries(2):
+                    response = self.client.get("/api/cart/")
+                self.assertEqual(len(response.data["items"]), size)
+
+    def test_serialize_cart(self):
+        for size in CART_SIZES:
+            with self.subTest(size=size):
+                self.fill_cart(size)
+                with self.assertNumQueries(2):
+                    data = serialize_cart(user=self.user)
+                self.assertEqual(len(data["items"]), size)
+
+    def test_serialize_loaded_cart(self):
+        # mutation views already hold the cart, so their response adds one query
+        for size in CART_SIZES:
+            with self.subTest(size=size):
+                cart = self.fill_cart(size)
+                with self.assertNumQueries(1):
+                    data = serialize_cart(cart=cart)
+                self.assertEqual(len(data["items"]), size)
+
+    def test_mutation_responses_do_not_grow_with_the_cart(self):
+        mutations = [
+            ("add", lambda: ("post", "/api/cart/add/", {"product_id": self.spare.pk, "quantity": 1})),
+            ("update", lambda: ("post", "/api/cart/update/", {"product_id": self.products[0].pk, "quantity": 3})),
+            ("remove", lambda: ("post", "/api/cart/remove/", {"product_id": self.products[0].pk})),
+            ("batch", lambda: ("post", "/api/cart/batch/", {"operations": [
+                {"op": "set", "product_id": self.products[0].pk, "quantity": 2},
+                {"op": "add", "product_id": self.spare.pk, "quantity": 1},
+            ]})),
+        ]
+        for name, request in mutations:
+            counts = {}
+            for size in CART_SIZES:
+                self.fill_cart(size)
+                counts[size], data = self.count_queries(*request())
+                self.assertIn("items", data)
+            with self.subTest(mutation=name):
+                self.assertEqual(len(set(counts.values())), 1, counts)
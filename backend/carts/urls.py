@@ -5,7 +5,8 @@ from .views import (
     GetCartSummaryView,   
     UpdateCartItemView, 
     RemoveFromCartView,
-    ClearCartView    
+    ClearCartView,
+    BatchCartView,
 )
 
 urlpatterns = [
@@ -15,4 +16,5 @@ urlpatterns = [
     path('api/cart/update/', UpdateCartItemView.as_view(), name='api_update_cart_item'),
     path('api/cart/remove/', RemoveFromCartView.as_view(), name='api_remove_from_cart'),
     path('api/cart/clear/', ClearCartView.as_view(), name='api_clear_cart'),
+    path('api/cart/batch/', BatchCartView.as_view(), name='api_batch_cart'),
 ]
@@ -6,12 +6,17 @@ from django.shortcuts import get_object_or_404
 from django.db import transaction
 
 from .models import Cart, CartItem
+from .reservations import hold, release_items
+from .services import (
+    CartBatchError, apply_cart_operations, cart_summary, invalidate_cart_summary, serialize_cart,
+)
 from products.models import Product
+from products.stock import InsufficientStock
 from .serializers import (
-    CartSerializer,
     AddToCartSerializer,
     UpdateCartItemSerializer,
     RemoveFromCartSerializer,
+    CartBatchSerializer,
 )
 
 
@@ -36,29 +41,57 @@ class AddToCartView(APIView):
 
         cart, _ = Cart.objects.get_or_create(user=request.user)
 
-        cart_item, created = CartItem.objects.get_or_create(
-            cart=cart,
-            product=product,
-            defaults={'quantity': quantity}
-        )
-
-        if not created:
-            cart_item.quantity += quantity
-            cart_item.save()
+        try:
+            with transaction.atomic():
+                cart_item, created = CartItem.objects.select_for_update().get_or_create(
+                    cart=cart,
+                    product=product,
+                    defaults={'quantity': quantity}
+                )
+                if not created:
+                    cart_item.quantity += quantity
+                # takes stock now if cart reservations are enabled
+                hold(cart_item, cart_item.quantity)
+                cart_item.save()
+        except InsufficientStock:
+            return Response(
+                {'error': 'Product out of stock'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
+        invalidate_cart_summary(request.user.pk)
         return Response(
-            CartSerializer(cart).data,
+            serialize_cart(cart=cart),
             status=status.HTTP_201_CREATED
         )
 
 
+class BatchCartView(APIView):
+    """POST: Apply several add/set/remove operations at once"""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = CartBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        cart, _ = Cart.objects.get_or_create(user=request.user)
+        try:
+            apply_cart_operations(cart, serializer.validated_data['operations'])
+        except CartBatchError as exc:
+            return Response(
+                {'error': 'Some operations could not be applied', 'items': exc.items},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(serialize_cart(cart=cart))
+
+
 class GetCartView(APIView):
     """GET: Get user's cart"""
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        cart, _ = Cart.objects.get_or_create(user=request.user)
-        return Response(CartSerializer(cart).data)
+        return Response(serialize_cart(user=request.user))
 
 
 class GetCartSummaryView(APIView):
@@ -66,16 +99,8 @@ class GetCartSummaryView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        cart, _ = Cart.objects.get_or_create(user=request.user)
-        items = cart.items.all()
-        
-        total_items = sum(item.quantity for item in items)
-        total_price = sum(float(item.product.price) * item.quantity for item in items)
-
-        return Response({
-            'total_items': total_items,
-            'total_price': total_price,
-        })
+        # one aggregate query or a cache hit; see carts/services.py
+        return Response(cart_summary(request.user))
 
 
 class UpdateCartItemView(APIView):
@@ -90,18 +115,28 @@ class UpdateCartItemView(APIView):
         quantity = serializer.validated_data['quantity']
 
         cart = get_object_or_404(Cart, user=request.user)
-        cart_item = get_object_or_404(CartItem, cart=cart, product_id=product_id)
 
-        if cart_item.product.stock_quantity < quantity:
+        try:
+            with transaction.atomic():
+                cart_item = get_object_or_404(
+                    CartItem.objects.select_for_update(of=('self',)).select_related('product'),
+                    cart=cart, product_id=product_id,
+                )
+                # advisory check; the authoritative one is the conditional
+                # stock update (reservation here, or at checkout)
+                if cart_item.product.stock_quantity + cart_item.reserved_quantity < quantity:
+                    raise InsufficientStock([])
+                hold(cart_item, quantity)
+                cart_item.quantity = quantity
+                cart_item.save()
+        except InsufficientStock:
             return Response(
                 {'error': 'Insufficient stock'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        cart_item.quantity = quantity
-        cart_item.save()
-
-        return Response(CartSerializer(cart).data)
+        invalidate_cart_summary(request.user.pk)
+        return Response(serialize_cart(cart=cart))
 
 
 class RemoveFromCartView(APIView):
@@ -115,10 +150,13 @@ class RemoveFromCartView(APIView):
         product_id = serializer.validated_data['product_id']
 
         cart = get_object_or_404(Cart, user=request.user)
-        cart_item = get_object_or_404(CartItem, cart=cart, product_id=product_id)
-        cart_item.delete()
+        with transaction.atomic():
+            cart_item = get_object_or_404(CartItem.objects.select_for_update(), cart=cart, product_id=product_id)
+            release_items([cart_item])
+            cart_item.delete()
 
-        return Response(CartSerializer(cart).data)
+        invalidate_cart_summary(request.user.pk)
+        return Response(serialize_cart(cart=cart))
 
 
 class ClearCartView(APIView):
@@ -127,7 +165,11 @@ class ClearCartView(APIView):
 
     def post(self, request):
         cart = get_object_or_404(Cart, user=request.user)
-        cart.items.all().delete()
+        with transaction.atomic():
+            items = list(cart.items.select_for_update())
+            release_items(items)
+            CartItem.objects.filter(pk__in=[item.pk for item in items]).delete()
+        invalidate_cart_summary(request.user.pk)
 
         return Response(
             {'message': 'Cart cleared successfully'},
@@ -0,0 +1,61 @@
+# coupons/cache.py
+"""
+In-process cache of coupon rules for the public coupon endpoints.
+
+Lookups by code go through a small TTL + LRU cache (cachetools); unknown
+codes are cached too, for a shorter time, so guessing codes does not reach
+the database on every keystroke. Entries are dropped whenever the shared
+Coupon version counter (backend/cache.py) moves, which the Coupon signals
+bump on save/delete. Without a shared cache (settings.CACHE_SHARED) that
+counter is per-worker, so lookups go straight to the database. `times_used`
+may lag behind by up to the TTL; checkout re-checks it with the conditional
+redeem UPDATE.
+"""
+from __future__ import annotations
+import threading
+
+from cachetools import TTLCache
+
+from backend.cache import get_model_versions, shared_cache_enabled
+
+FOUND_TTL = 60
+MISSING_TTL = 10
+
+_lock = threading.Lock()
+_found = TTLCache(maxsize=1024, ttl=FOUND_TTL)
+_missing = TTLCache(maxsize=4096, ttl=MISSING_TTL)
+_state = {"version": None}
+
+
+def clear() -> None:
+    with _lock:
+        _found.clear()
+        _missing.clear()
+        _state["version"] = None
+
+
+def get_coupon(code: str):
+    """Coupon with this code (treat as read-only), or None."""
+    from .models import Coupon
+
+    if not shared_cache_enabled():
+        return Coupon.objects.filter(code=code).first()
+    version = get_model_versions([Coupon])[0]
+    with _lock:
+        if _state["version"] != version:
+            _found.clear()
+            _missing.clear()
+            _state["version"] = version
+        if code in _found:
+            return _found[code]
+        if code in _missing:
+            return None
+
+    coupon = Coupon.objects.filter(code=code).first()
+    with _lock:
+        if _state["version"] == version:
+            if coupon is None:
+                _missing[code] = True
+            else:
+                _found[code] = coupon
+    return coupon
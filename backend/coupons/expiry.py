@@ -0,0 +1,41 @@
+# coupons/expiry.py
+"""
+Incremental coupon expiry.
+
+Read paths never trust the stored `is_active` alone (see
+Coupon.is_redeemable / CouponQuerySet.redeemable), so the sweep only keeps
+the flag tidy for admin listings. Each run deactivates coupons whose
+`expires_at` falls between the previous watermark and now, a range scan on
+the partial index over active coupons, and then moves the watermark.
+Coupons saved with a past expiry are deactivated by Coupon.save itself.
+"""
+from __future__ import annotations
+
+from django.db import transaction
+from django.utils import timezone
+
+from backend.cache import bump_model_version
+
+
+def sweep_expired_coupons(now=None) -> int:
+    """Deactivate coupons expired since the last sweep; returns how many."""
+    from .models import Coupon, CouponExpirySweep
+
+    now = now or timezone.now()
+    with transaction.atomic():
+        sweep = CouponExpirySweep.objects.select_for_update().order_by("pk").first()
+        expired = Coupon.objects.filter(is_active=True, expires_at__lte=now)
+        if sweep is not None:
+            expired = expired.filter(expires_at__gt=sweep.swept_until)
+        count = expired.update(is_active=False, updated_at=now)
+
+        if sweep is None:
+            CouponExpirySweep.objects.create(swept_until=now)
+        else:
+            sweep.swept_until = now
+            sweep.save(update_fields=["swept_until", "updated_at"])
+
+    if count:
+        # queryset updates skip the signals that invalidate cached coupons
+        bump_model_version(Coupon)
+    return count
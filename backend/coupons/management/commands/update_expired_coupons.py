@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 from django.utils import timezone
+from backend.cache import bump_model_version
 from coupons.models import Coupon
 
 class Command(BaseCommand):
@@ -11,6 +12,9 @@ class Command(BaseCommand):
             is_active=True
         )
         count = expired_coupons.update(is_active=False)
+        if count:
+            # queryset updates skip the signals that invalidate cached coupons
+            bump_model_version(Coupon)
         self.stdout.write(
             self.style.SUCCESS(f'Đã cập nhật {count} coupon')
         )
\ No newline at end of file
@@ -1,4 +1,27 @@
+from decimal import Decimal
 from django.db import models
+from django.db.models import F, Q
+from django.utils import timezone
+
+
+class CouponQuerySet(models.QuerySet):
+    def redeemable(self, now=None):
+        """Active, unexpired coupons with uses left."""
+        now = now or timezone.now()
+        return self.filter(is_active=True, expires_at__gt=now).filter(
+            Q(usage_limit__isnull=True) | Q(times_used__lt=F("usage_limit"))
+        )
+
+    def redeem(self, code) -> bool:
+        """
+        Count one use of `code` with a single conditional UPDATE; False if the
+        coupon is missing, expired, inactive or used up. No row lock is held
+        before the statement, so concurrent checkouts never exceed usage_limit.
+        """
+        return self.redeemable().filter(code=code).update(
+            times_used=F("times_used") + 1, updated_at=timezone.now(),
+        ) == 1
+
 
 class Coupon(models.Model):
     code = models.CharField(max_length=255, unique=True)
@@ -12,8 +35,14 @@ class Coupon(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = CouponQuerySet.as_manager()
+
     class Meta:
-        db_table = 'coupons' 
+        db_table = 'coupons'
+        indexes = [
+            # only active coupons can still expire; see coupons/expiry.py
+            models.Index(fields=['expires_at'], name='idx_coupons_active_expires', condition=Q(is_active=True)),
+        ]
     
     def is_expired(self):
         from django.utils import timezone
@@ -24,5 +53,35 @@ class Coupon(models.Model):
         self.is_active = not self.is_expired()
         super().save(*args, **kwargs)
 
+    def is_redeemable(self, now=None) -> bool:
+        """Same conditions as CouponQuerySet.redeemable(), on this instance."""
+        now = now or timezone.now()
+        return (
+            self.is_active
+            and self.expires_at > now
+            and (self.usage_limit is None or self.times_used < self.usage_limit)
+        )
+
+    def calculate_discount(self, subtotal) -> Decimal:
+        """Discount for `subtotal`, or 0 below the minimum purchase."""
+        if subtotal < self.min_purchase_amount:
+            return Decimal("0.00")
+        discount = (subtotal * self.discount_percent) / 100
+        if self.max_discount_amount:
+            discount = min(discount, self.max_discount_amount)
+        return discount
+
     def __str__(self):
         return self.code
+
+
+class CouponExpirySweep(models.Model):
+    """Watermark of the incremental expiry sweep (one row)."""
+    swept_until = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'coupon_expiry_sweeps'
+
+    def __str__(self):
+        return f"Coupons swept until {self.swept_until}"
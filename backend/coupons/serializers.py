@@ -43,10 +43,25 @@ class CouponDetailSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "created_at"]
 
 class PublicCouponDetailSerializer(serializers.ModelSerializer):
+    # computed from expiry and usage, not just the stored flag
+    is_active = serializers.SerializerMethodField()
+
     class Meta:
         model = Coupon
         fields = [
             "code", "discount_percent", "max_discount_amount", "min_purchase_amount",
             "is_active", 
         ]
-        read_only_fields = ["id", "created_at", "updated_at"]
\ No newline at end of file
+        read_only_fields = ["id", "created_at", "updated_at"]
+
+    def get_is_active(self, obj):
+        return obj.is_redeemable()
+
+
+class CouponPreviewSerializer(serializers.Serializer):
+    code = serializers.CharField()
+    valid = serializers.BooleanField()
+    detail = serializers.CharField(allow_null=True)
+    subtotal_amount = serializers.DecimalField(max_digits=12, decimal_places=2)
+    discount_amount = serializers.DecimalField(max_digits=12, decimal_places=2)
+    final_amount = serializers.DecimalField(max_digits=12, decimal_places=2)
@@ -0,0 +1,15 @@
+# coupons/signals.py
+from django.db.models.signals import post_delete, post_save
+
+from backend.cache import bump_version_on_change
+from . import cache
+from .models import Coupon
+
+
+def drop_cached_coupons(sender, **kwargs):
+    cache.clear()
+
+
+for _receiver in (bump_version_on_change, drop_cached_coupons):
+    post_save.connect(_receiver, sender=Coupon)
+    post_delete.connect(_receiver, sender=Coupon)
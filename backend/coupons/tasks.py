@@ -1,6 +1,8 @@
 from celery import shared_task
-from django.core.management import call_command
+
+from .expiry import sweep_expired_coupons
 
 @shared_task
 def update_expired_coupons():
-    call_command('update_expired_coupons')
\ No newline at end of file
+    # incremental: only coupons expired since the previous run
+    sweep_expired_coupons()
@@ -1,3 +1,66 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase, override_settings, skipUnlessDBFeature
+from django.utils import timezone
+
+from backend.testing import run_concurrently
+
+from .cache import get_coupon
+from .models import Coupon
+
+
+@skipUnlessDBFeature("has_select_for_update")
+class ConcurrentRedeemTests(TransactionTestCase):
+    """Racing redemptions never push times_used past usage_limit."""
+    attempts = 12
+    usage_limit = 5
+
+    def setUp(self):
+        self.coupon = Coupon.objects.create(
+            code="SALE",
+            discount_percent=10,
+            min_purchase_amount=0,
+            usage_limit=self.usage_limit,
+            expires_at=timezone.now() + timedelta(days=1),
+        )
+
+    def test_usage_limit_is_never_exceeded(self):
+        results = run_concurrently(Coupon.objects.redeem, [("SALE",)] * self.attempts)
+
+        self.assertEqual([r for r in results if not isinstance(r, bool)], [])
+        self.assertEqual(results.count(True), self.usage_limit)
+        self.coupon.refresh_from_db()
+        self.assertEqual(self.coupon.times_used, self.usage_limit)
+        self.assertFalse(Coupon.objects.redeem("SALE"))
+
+
+class CouponLookupCacheTests(TestCase):
+    """get_coupon only serves from memory while the version counter is shared."""
+
+    def setUp(self):
+        cache.clear()
+        self.coupon = Coupon.objects.create(
+            code="SALE",
+            discount_percent=10,
+            min_purchase_amount=0,
+            expires_at=timezone.now() + timedelta(days=1),
+        )
+
+    def deactivate_elsewhere(self):
+        # a queryset update sends no signal, like a save made by another worker
+        # whose version bump this process cannot see
+        Coupon.objects.filter(pk=self.coupon.pk).update(is_active=False)
+
+    @override_settings(CACHE_SHARED=False)
+    def test_unshared_cache_reads_the_database(self):
+        self.assertTrue(get_coupon("SALE").is_active)
+        self.deactivate_elsewhere()
+        with self.assertNumQueries(1):
+            self.assertFalse(get_coupon("SALE").is_active)
+
+    @override_settings(CACHE_SHARED=True)
+    def test_shared_cache_serves_repeat_lookups(self):
+        get_coupon("SALE")
+        with self.assertNumQueries(0):
+            self.assertEqual(get_coupon("SALE").pk, self.coupon.pk)
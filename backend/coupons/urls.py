@@ -4,6 +4,7 @@ from . import views
 urlpatterns = [
     # Public routes
     path('api/coupons/<str:code>/', views.CouponDetailAPIView.as_view(), name='coupon-detail'),
+    path('api/coupons/<str:code>/preview/', views.CouponPreviewAPIView.as_view(), name='coupon-preview'),
 
     # Admin routes
     path('api/admin/coupons/', views.AdminCouponCreateAPIView.as_view(), name='admin-coupon-create'),
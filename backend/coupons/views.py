@@ -3,8 +3,17 @@ from rest_framework import generics
 from rest_framework.permissions import IsAdminUser, AllowAny, IsAuthenticated
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework.pagination import PageNumberPagination
+from decimal import Decimal
+from django.http import Http404
+from django.utils import timezone
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from carts.services import cart_summary
+from .cache import get_coupon
 from .models import Coupon
-from .serializers import CouponSerializer, CouponDetailSerializer, PublicCouponDetailSerializer
+from .serializers import (
+    CouponSerializer, CouponDetailSerializer, PublicCouponDetailSerializer, CouponPreviewSerializer,
+)
 
 class CouponPagination(PageNumberPagination):
     page_size = 10
@@ -21,6 +30,47 @@ class CouponDetailAPIView(generics.RetrieveAPIView):
     permission_classes = [AllowAny]
     lookup_field = 'code'
 
+    def get_object(self):
+        # served from the in-process coupon cache; see coupons/cache.py
+        coupon = get_coupon(self.kwargs['code'])
+        if coupon is None:
+            raise Http404
+        return coupon
+
+
+class CouponPreviewAPIView(APIView):
+    """
+    POST /api/coupons/<code>/preview/
+    Tính thử giảm giá của coupon cho giỏ hàng hiện tại (không tạo đơn, không
+    tính lượt dùng).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, code):
+        coupon = get_coupon(code)
+        if coupon is None:
+            raise Http404
+
+        # uncached: the discount must follow current prices
+        subtotal = cart_summary(request.user, cached=False)['total_price']
+
+        detail = None
+        if not coupon.is_redeemable(timezone.now()):
+            detail = 'Coupon is expired, inactive or fully used.'
+        elif subtotal < coupon.min_purchase_amount:
+            detail = 'Minimum purchase requirement not met.'
+        discount = coupon.calculate_discount(subtotal) if detail is None else Decimal('0.00')
+
+        data = CouponPreviewSerializer({
+            'code': coupon.code,
+            'valid': detail is None,
+            'detail': detail,
+            'subtotal_amount': subtotal,
+            'discount_amount': discount,
+            'final_amount': max(Decimal('0.00'), subtotal - discount),
+        }).data
+        return Response(data)
+
 
 # --- ADMIN API ---
 class AdminCouponCreateAPIView(generics.ListCreateAPIView):
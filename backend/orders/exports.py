@@ -0,0 +1,45 @@
+# orders/exports.py
+"""
+Order export for accounting.
+
+One row per order line, with the order's columns repeated, read straight
+from `order_items` joined to `orders` as tuples through a server-side
+cursor (`.iterator(chunk_size=...)`). Nothing is serialized per order, so
+memory stays flat however many orders match; see backend/streaming.py for
+the CSV / JSONL writers.
+"""
+from __future__ import annotations
+
+from .filters import filter_orders
+from .models import Order, OrderItem
+
+EXPORT_TYPES = ("csv", "jsonl")
+CHUNK_SIZE = 2000
+
+EXPORT_FIELDS = (
+    "order_id", "created_at", "status", "payment_method",
+    "customer_name", "customer_phone", "customer_email", "coupon_code",
+    "subtotal_amount", "discount_amount", "final_amount",
+    "product_id", "product_name", "quantity", "price_at_order", "line_total",
+)
+
+_COLUMNS = (
+    "order_id", "order__created_at", "order__status", "order__payment_method",
+    "order__customer_name", "order__customer_phone", "order__customer_email", "order__coupon__code",
+    "order__subtotal_amount", "order__discount_amount", "order__final_amount",
+    "product_id", "product_name", "quantity", "price_at_order", "line_total",
+)
+
+
+def export_rows(params):
+    """Rows (tuples in EXPORT_FIELDS order) for the orders matching `params` (see orders/filters.py)."""
+    orders = filter_orders(Order.objects.all(), params).values("pk")
+    rows = (
+        OrderItem.objects
+            .filter(order__in=orders)
+            .order_by("order_id", "id")
+            .values_list(*_COLUMNS)
+            .iterator(chunk_size=CHUNK_SIZE)
+    )
+    # ISO timestamps in both formats
+    return ((row[0], row[1].isoformat(), *row[2:]) for row in rows)
@@ -0,0 +1,97 @@
+# orders/filters.py
+"""
+Server-side filtering for the admin order list.
+
+Query parameters (all optional, combined with AND):
+
+    status          one or more statuses, repeated or comma-separated
+    payment_method  COD / BANK_TRANSFER
+    created_after   ISO date or datetime, inclusive
+    created_before  ISO date (whole day included) or datetime, exclusive
+    phone           customer phone prefix
+    email           customer email prefix (case-insensitive)
+    coupon          coupon id or exact code
+
+Unrecognized values are ignored, as in the product list. The composite
+indexes on (status, created_at) and (user, created_at) serve the usual
+"status, newest first" screens, and the PostgreSQL pattern indexes added in
+migration 0004 serve the phone / email prefix searches.
+"""
+from __future__ import annotations
+import re
+from datetime import datetime, time, timedelta
+
+from django.db.models.functions import Lower
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import OrderStatus, PaymentMethod
+
+# ASCII digits that fit a bigint; str.isdigit() also accepts "²", which int() rejects
+_COUPON_ID_RE = re.compile(r"[0-9]{1,18}")
+
+
+def _multi(params, name) -> list[str]:
+    return [
+        value.strip().upper()
+        for raw in params.getlist(name)
+        for value in raw.split(",")
+        if value.strip()
+    ]
+
+
+def _moment(value: str, end_of_day: bool = False):
+    """An aware datetime for an ISO date/datetime string, or None."""
+    value = (value or "").strip()
+    if not value:
+        return None
+    try:
+        moment = parse_datetime(value)
+        if moment is None:
+            day = parse_date(value)
+            if day is None:
+                return None
+            if end_of_day:
+                day += timedelta(days=1)
+            moment = datetime.combine(day, time.min)
+    except ValueError:
+        return None
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def filter_orders(queryset, params):
+    """Apply the admin order filters in `params` (a QueryDict) to `queryset`."""
+    statuses = [s for s in _multi(params, "status") if s in OrderStatus.values]
+    if statuses:
+        queryset = queryset.filter(status__in=statuses)
+
+    payment_method = params.get("payment_method", "").strip().upper()
+    if payment_method in PaymentMethod.values:
+        queryset = queryset.filter(payment_method=payment_method)
+
+    created_after = _moment(params.get("created_after"))
+    if created_after:
+        queryset = queryset.filter(created_at__gte=created_after)
+    created_before = _moment(params.get("created_before"), end_of_day=True)
+    if created_before:
+        queryset = queryset.filter(created_at__lt=created_before)
+
+    phone = params.get("phone", "").strip()
+    if phone:
+        queryset = queryset.filter(customer_phone__startswith=phone)
+
+    email = params.get("email", "").strip().lower()
+    if email:
+        # matches the lower(customer_email) pattern index
+        queryset = queryset.alias(email_lower=Lower("customer_email")).filter(email_lower__startswith=email)
+
+    coupon = params.get("coupon", "").strip()
+    if coupon:
+        if _COUPON_ID_RE.fullmatch(coupon):
+            queryset = queryset.filter(coupon_id=int(coupon))
+        else:
+            queryset = queryset.filter(coupon__code=coupon)
+
+    return queryset
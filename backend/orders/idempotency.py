@@ -0,0 +1,89 @@
+# orders/idempotency.py
+"""
+Idempotency-Key support for order creation.
+
+The key row is inserted at the start of the checkout transaction and the
+response is written to it before commit. A retry with the same key either
+finds the committed row and replays the stored response, or (if the first
+request is still running) blocks on the unique (user, key) index until it
+commits, then replays. Only successful (2xx) responses are kept: when the
+first request fails, its row is deleted (or rolled back with everything else
+on an exception) and a retry, e.g. once the cart is fixed, runs normally.
+Expired keys are purged by the orders.tasks.purge_idempotency_keys beat task.
+"""
+from __future__ import annotations
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+
+def key_ttl() -> timedelta:
+    return timedelta(hours=getattr(settings, "IDEMPOTENCY_KEY_TTL_HOURS", 24))
+
+
+def request_fingerprint(request) -> str:
+    body = json.dumps(request.data, sort_keys=True, default=str)
+    return hashlib.sha256(f"{request.method} {request.path}\n{body}".encode()).hexdigest()
+
+
+def claim(request, key: str):
+    """
+    Reserve `key` for this request (inside the caller's transaction).
+    Returns (record, None) to proceed, or (None, response) to answer now.
+    """
+    if len(key) > MAX_KEY_LENGTH:
+        return None, Response(
+            {"detail": f"{HEADER} must be at most {MAX_KEY_LENGTH} characters."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    fingerprint = request_fingerprint(request)
+    try:
+        with transaction.atomic():
+            record = IdempotencyKey.objects.create(
+                user=request.user, key=key, request_fingerprint=fingerprint,
+            )
+        return record, None
+    except IntegrityError:
+        pass
+
+    record = IdempotencyKey.objects.get(user=request.user, key=key)
+    if record.created_at < timezone.now() - key_ttl():
+        # expired but not purged yet: start over with this request
+        record.delete()
+        return claim(request, key)
+    if record.request_fingerprint != fingerprint:
+        return None, Response(
+            {"detail": f"{HEADER} was already used with a different request."},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    return None, Response(
+        record.response_body, status=record.status_code,
+        headers={"Idempotent-Replayed": "true"},
+    )
+
+
+def store(record, response) -> None:
+    """Keep a successful response for replay; release the key otherwise."""
+    if not status.is_success(response.status_code):
+        record.delete()
+        return
+    record.status_code = response.status_code
+    record.response_body = response.data
+    record.save(update_fields=["status_code", "response_body"])
+
+
+def purge_expired() -> int:
+    deleted, _ = IdempotencyKey.objects.filter(created_at__lt=timezone.now() - key_ttl()).delete()
+    return deleted
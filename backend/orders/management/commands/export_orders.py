@@ -0,0 +1,38 @@
+import sys
+
+from django.core.management.base import BaseCommand
+from django.http import QueryDict
+
+from backend.streaming import csv_lines, jsonl_lines
+from orders.exports import EXPORT_FIELDS, EXPORT_TYPES, export_rows
+
+class Command(BaseCommand):
+    help = 'Export order lines as CSV or JSONL (to a file or stdout) for accounting'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help='File to write (default: stdout)')
+        parser.add_argument('--type', choices=EXPORT_TYPES, default='csv')
+        parser.add_argument('--status', action='append', default=[],
+                            help='Order status to include (repeatable)')
+        parser.add_argument('--created-after', help='ISO date or datetime, inclusive')
+        parser.add_argument('--created-before', help='ISO date (whole day included) or datetime')
+
+    def handle(self, *args, **options):
+        params = QueryDict(mutable=True)
+        params.setlist('status', options['status'])
+        for name in ('created_after', 'created_before'):
+            if options[name]:
+                params[name] = options[name]
+
+        write_lines = csv_lines if options['type'] == 'csv' else jsonl_lines
+        lines = write_lines(EXPORT_FIELDS, export_rows(params))
+        if not options['output']:
+            sys.stdout.writelines(lines)
+            return
+
+        count = -1 if options['type'] == 'csv' else 0  # csv has a header line
+        with open(options['output'], 'w', encoding='utf-8', newline='') as fh:
+            for line in lines:
+                fh.write(line)
+                count += 1
+        self.stderr.write(self.style.SUCCESS(f"Exported {count} order lines to {options['output']}"))
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.4 on 2026-10-16 23:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def create_pattern_indexes(apps, schema_editor):
+    # LIKE 'prefix%' index support is PostgreSQL-specific (non-C collations)
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS idx_orders_phone_pattern '
+        'ON orders (customer_phone varchar_pattern_ops)'
+    )
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS idx_orders_email_pattern '
+        'ON orders (lower(customer_email) text_pattern_ops)'
+    )
+
+
+def drop_pattern_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS idx_orders_phone_pattern')
+    schema_editor.execute('DROP INDEX IF EXISTS idx_orders_email_pattern')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coupons', '0002_coupon_expiry_sweep'),
+        ('orders', '0003_idempotency_key'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['user', 'created_at'], name='idx_orders_user_created'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['status', 'created_at'], name='idx_orders_status_created'),
+        ),
+        # both are leading columns of the composite indexes above
+        migrations.RemoveIndex(
+            model_name='order',
+            name='idx_orders_user',
+        ),
+        migrations.RemoveIndex(
+            model_name='order',
+            name='idx_orders_status',
+        ),
+        migrations.RunPython(create_pattern_indexes, drop_pattern_indexes),
+    ]
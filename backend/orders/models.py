@@ -1,5 +1,6 @@
 from decimal import Decimal
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from products.models import Product
 from coupons.models import Coupon
@@ -51,13 +52,17 @@ class Order(models.Model):
     reject_reason = models.CharField(max_length=64, choices=RejectReason.choices, blank=True, null=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
+    # change marker for the analytics rollups; queryset updates must set it
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = "orders"
         indexes = [
-            models.Index(fields=["user"], name="idx_orders_user"),
-            models.Index(fields=["status"], name="idx_orders_status"),
+            # per-user history and status screens, newest first (see orders/filters.py)
+            models.Index(fields=["user", "created_at"], name="idx_orders_user_created"),
+            models.Index(fields=["status", "created_at"], name="idx_orders_status_created"),
             models.Index(fields=["created_at"], name="idx_orders_created_at"),
+            models.Index(fields=["updated_at"], name="idx_orders_updated_at"),
         ]
         ordering = ["-created_at"]
 
@@ -81,3 +86,25 @@ class OrderItem(models.Model):
 
     def __str__(self):
         return f"{self.product_name} × {self.quantity}"
+
+
+class IdempotencyKey(models.Model):
+    """Stored outcome of a POST /api/orders/ made with an Idempotency-Key header."""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="idempotency_keys")
+    key = models.CharField(max_length=255)
+    request_fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.JSONField(encoder=DjangoJSONEncoder, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "order_idempotency_keys"
+        constraints = [
+            models.UniqueConstraint(fields=["user", "key"], name="uniq_idempotency_user_key"),
+        ]
+        indexes = [
+            models.Index(fields=["created_at"], name="idx_idempotency_created_at"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id}:{self.key}"
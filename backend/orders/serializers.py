@@ -1,7 +1,9 @@
 # orders/serializers.py
 from decimal import Decimal
+from django.db import transaction
 from rest_framework import serializers
 from .models import Order, OrderItem, OrderStatus, CancelReason, RejectReason, PaymentMethod
+from .transitions import can_transition, transition_orders
 from products.models import Product
 
 # --- Output serializers ---
@@ -30,6 +32,23 @@ class OrderSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "subtotal_amount", "discount_amount", "final_amount", "pricing_snapshot", "created_at", "status"]
 
 
+class OrderListSerializer(serializers.ModelSerializer):
+    """Lightweight row for order listings; use OrderSerializer (or ?expand=items) for items."""
+    item_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Order
+        fields = [
+            "id", "status",
+            "customer_name", "customer_phone", "customer_email",
+            "payment_method",
+            "subtotal_amount", "discount_amount", "final_amount",
+            "item_count",
+            "created_at",
+        ]
+        read_only_fields = fields
+
+
 # --- Input validators (client sends only order info; items come from cart) ---
 
 class OrderCreateSerializer(serializers.Serializer):
@@ -62,4 +81,34 @@ class AdminOrderUpdateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError({"reject_reason": "This field is required when rejecting an order."})
         if status == OrderStatus.CANCELLED:
             raise serializers.ValidationError({"status": "Admin cannot set status to CANCELLED. Use REJECTED."})
+        current = self.instance.status if self.instance else None
+        if status and current and status != current and not can_transition(current, status):
+            raise serializers.ValidationError({"status": f"Cannot change status from {current} to {status}."})
+        return attrs
+
+    def update(self, instance, validated_data):
+        status = validated_data.pop("status", instance.status)
+        with transaction.atomic():
+            if status != instance.status:
+                # conditional on the status validated above; restocks on REJECTED
+                moved = transition_orders(
+                    [instance.pk], status, sources=[instance.status],
+                    reject_reason=validated_data.pop("reject_reason", instance.reject_reason),
+                )
+                if not moved:
+                    raise serializers.ValidationError({"status": "The order status has changed, please reload."})
+                instance.refresh_from_db()
+            return super().update(instance, validated_data)
+
+
+class AdminOrderBulkStatusSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), min_length=1, max_length=1000)
+    status = serializers.ChoiceField(
+        choices=[choice for choice in OrderStatus.choices if choice[0] != OrderStatus.CANCELLED]
+    )
+    reject_reason = serializers.ChoiceField(choices=RejectReason.choices, required=False)
+
+    def validate(self, attrs):
+        if attrs["status"] == OrderStatus.REJECTED and not attrs.get("reject_reason"):
+            raise serializers.ValidationError({"reject_reason": "This field is required when rejecting orders."})
         return attrs
@@ -0,0 +1,7 @@
+from celery import shared_task
+
+from .idempotency import purge_expired
+
+@shared_task
+def purge_idempotency_keys():
+    purge_expired()
@@ -1,3 +1,426 @@
-from django.test import TestCase
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import timedelta
 
-# Create your tests here.
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Sum
+from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from backend.streaming import iter_records
+from backend.testing import run_concurrently
+from carts.models import Cart, CartItem
+from coupons.models import Coupon
+from products.models import Category, Product
+from users.models import User
+
+from .models import IdempotencyKey, Order, OrderItem
+
+# Order counts per list test; the last one spans more than a page
+ORDER_COUNTS = (1, 5, 25)
+
+# Slowest acceptable checkout while all buyers contend for the same rows
+CHECKOUT_LATENCY_BUDGET = 5.0
+
+CHECKOUT = {
+    "customer_name": "Buyer",
+    "customer_phone": "0900000000",
+    "customer_address": "1 Street",
+    "payment_method": "COD",
+}
+
+
+@skipUnlessDBFeature("has_select_for_update")
+class ConcurrentCheckoutTests(TransactionTestCase):
+    """Checkouts racing for the same stock never oversell and never deadlock."""
+    buyers = 8
+    stock = 5
+
+    def setUp(self):
+        category = Category.objects.create(name="Fruit", slug="fruit")
+        self.apple = Product.objects.create(name="Apple", price=10, category=category, stock_quantity=self.stock)
+        self.kale = Product.objects.create(name="Kale", price=5, category=category, stock_quantity=self.stock)
+        self.users = []
+        for i in range(self.buyers):
+            user = User.objects.create_user(username=f"buyer{i}", email=f"buyer{i}@example.com", password="pw")
+            cart = Cart.objects.create(user=user)
+            # alternate the line order so carts name the products in opposite orders
+            products = [self.apple, self.kale] if i % 2 else [self.kale, self.apple]
+            for product in products:
+                CartItem.objects.create(cart=cart, product=product, quantity=1)
+            self.users.append(user)
+
+    def checkout(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client.post("/api/orders/", CHECKOUT, format="json").status_code
+
+    def timed_checkout(self, user):
+        started = time.perf_counter()
+        status_code = self.checkout(user)
+        return status_code, started, time.perf_counter()
+
+    def test_no_oversell_or_deadlock(self):
+        results = run_concurrently(self.checkout, [(user,) for user in self.users])
+
+        self.assertEqual([r for r in results if not isinstance(r, int)], [])
+        self.assertEqual(results.count(201), self.stock)
+        self.assertEqual(results.count(400), self.buyers - self.stock)
+
+        for product in (self.apple, self.kale):
+            product.refresh_from_db()
+            self.assertEqual(product.stock_quantity, 0)
+            self.assertFalse(product.is_in_stock)
+            sold = OrderItem.objects.filter(product=product).aggregate(total=Sum("quantity"))["total"]
+            self.assertEqual(sold, self.stock)
+        self.assertEqual(Order.objects.count(), self.stock)
+
+    def test_checkout_rate(self):
+        """Measure concurrent checkouts that all succeed on the same two product rows."""
+        Product.objects.update(stock_quantity=self.buyers, is_in_stock=True)
+        results = run_concurrently(self.timed_checkout, [(user,) for user in self.users])
+
+        self.assertEqual([r for r in results if not isinstance(r, tuple)], [])
+        self.assertEqual([status_code for status_code, _, _ in results], [201] * self.buyers)
+        latencies = sorted(end - start for _, start, end in results)
+        elapsed = max(end for _, _, end in results) - min(start for _, start, _ in results)
+        sys.stderr.write(
+            f"\n{self.buyers} concurrent checkouts: {self.buyers / elapsed:.1f}/s, "
+            f"median {latencies[len(latencies) // 2] * 1000:.0f} ms, max {latencies[-1] * 1000:.0f} ms\n"
+        )
+        self.assertLess(latencies[-1], CHECKOUT_LATENCY_BUDGET)
+
+
+class OrderListQueryCountTests(TestCase):
+    """Order listings cost the same number of queries however many orders and items they hold."""
+
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(name="Fruit", slug="fruit")
+        cls.products = [
+            Product.objects.create(name=f"Apple {i}", price=10, category=category, stock_quantity=100)
+            for i in range(3)
+        ]
+        cls.admin = User.objects.create_user(
+            username="admin", email="admin@example.com", password="pw", is_staff=True
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def place_orders(self, count):
+        user = User.objects.create_user(username=f"buyer{count}", email=f"buyer{count}@example.com", password="pw")
+        for _ in range(count):
+            order = Order.objects.create(user=user, final_amount=30, **CHECKOUT)
+            OrderItem.objects.bulk_create(
+                OrderItem(order=order, product=product, product_name=product.name,
+                          quantity=1, price_at_order=10, line_total=10)
+                for product in self.products
+            )
+        return user
+
+    def list_orders(self, user, path, params, queries):
+        self.client.force_authenticate(user)
+        with self.assertNumQueries(queries):
+            response = self.client.get(path, params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_customer_list(self):
+        for count in ORDER_COUNTS:
+            with self.subTest(orders=count):
+                user = self.place_orders(count)
+                data = self.list_orders(user, "/api/orders/", {}, 2)
+                self.assertEqual(data["count"], count)
+                self.assertEqual(len(data["results"]), min(count, 20))
+                self.assertEqual(data["results"][0]["item_count"], len(self.products))
+
+    def test_customer_list_with_items(self):
+        for count in ORDER_COUNTS:
+            with self.subTest(orders=count):
+                user = self.place_orders(count)
+                data = self.list_orders(user, "/api/orders/", {"expand": "items"}, 3)
+                self.assertEqual(len(data["results"]), min(count, 20))
+                self.assertEqual(len(data["results"][0]["items"]), len(self.products))
+
+    def test_admin_list(self):
+        total = 0
+        for count in ORDER_COUNTS:
+            total += count
+            with self.subTest(orders=total):
+                self.place_orders(count)
+                data = self.list_orders(self.admin, "/api/admin/orders/", {}, 2)
+                self.assertEqual(data["count"], total)
+                self.assertEqual(len(data["results"]), min(total, 20))
+
+    def test_admin_list_with_items(self):
+        total = 0
+        for count in ORDER_COUNTS:
+            total += count
+            with self.subTest(orders=total):
+                self.place_orders(count)
+                data = self.list_orders(self.admin, "/api/admin/orders/", {"expand": "items"}, 3)
+                self.assertEqual(len(data["results"]), min(total, 20))
+                self.assertTrue(all(len(o["items"]) == len(self.products) for o in data["results"]))
+
+    def test_admin_keyset_pages(self):
+        self.place_orders(25)
+        data = self.list_orders(self.admin, "/api/admin/orders/", {"cursor": "", "expand": "items"}, 2)
+        self.assertEqual(len(data["results"]), 20)
+        data = self.list_orders(self.admin, data["next"], {}, 2)
+        self.assertEqual(len(data["results"]), 5)
+
+
+class AdminOrderFilterTests(TestCase):
+    """Malformed filter values narrow the list instead of failing the request."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="admin", email="admin@example.com", password="pw", is_staff=True
+        )
+        cls.coupon = Coupon.objects.create(
+            code="SALE10", discount_percent=10, min_purchase_amount=0,
+            expires_at=timezone.now() + timedelta(days=1),
+        )
+        cls.order = Order.objects.create(user=cls.admin, coupon=cls.coupon, **CHECKOUT)
+        Order.objects.create(user=cls.admin, **CHECKOUT)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def ids(self, **params):
+        response = self.client.get("/api/admin/orders/", params)
+        self.assertEqual(response.status_code, 200)
+        return [row["id"] for row in response.data["results"]]
+
+    def test_coupon_by_id_and_code(self):
+        self.assertEqual(self.ids(coupon=str(self.coupon.pk)), [self.order.pk])
+        self.assertEqual(self.ids(coupon="SALE10"), [self.order.pk])
+
+    def test_odd_coupon_values(self):
+        for value in ("²", "١٢", "99999999999999999999999", "-1", "1.5"):
+            with self.subTest(coupon=value):
+                self.assertEqual(self.ids(coupon=value), [])
+
+    def test_malformed_dates_are_ignored(self):
+        self.assertEqual(len(self.ids(created_after="2024-13-45", created_before="yesterday")), 2)
+
+
+class IdempotentCheckoutTests(TestCase):
+    """Idempotency-Key replays successful checkouts only."""
+
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(name="Fruit", slug="fruit")
+        cls.apple = Product.objects.create(name="Apple", price=10, category=category, stock_quantity=5)
+        cls.user = User.objects.create_user(username="buyer", email="buyer@example.com", password="pw")
+        cls.cart = Cart.objects.create(user=cls.user)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def checkout(self, key, payload=CHECKOUT):
+        return self.client.post("/api/orders/", payload, format="json", HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_success_is_replayed(self):
+        CartItem.objects.create(cart=self.cart, product=self.apple, quantity=2)
+        first = self.checkout("k1")
+        self.assertEqual(first.status_code, 201)
+        retry = self.checkout("k1")
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(retry.data["id"], first.data["id"])
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_failure_releases_the_key(self):
+        response = self.checkout("k2")
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(IdempotencyKey.objects.filter(key="k2").exists())
+
+        CartItem.objects.create(cart=self.cart, product=self.apple, quantity=1)
+        response = self.checkout("k2")
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn("Idempotent-Replayed", response)
+
+    def test_key_reused_with_another_body(self):
+        CartItem.objects.create(cart=self.cart, product=self.apple, quantity=1)
+        self.assertEqual(self.checkout("k3").status_code, 201)
+        response = self.checkout("k3", {**CHECKOUT, "customer_name": "Someone else"})
+        self.assertEqual(response.status_code, 422)
+
+
+class AdminOrderExportTests(TestCase):
+    """Order exports stream one row per line, escape formulas in CSV and read back unchanged."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="admin", email="admin@example.com", password="pw", is_staff=True
+        )
+        category = Category.objects.create(name="Fruit", slug="fruit")
+        apple = Product.objects.create(name="Apple", price=10, category=category, stock_quantity=5)
+        cls.order = Order.objects.create(
+            user=cls.admin, final_amount=30,
+            **{**CHECKOUT, "customer_name": '=HYPERLINK("http://evil","x")', "customer_phone": "+84900000000"},
+        )
+        for name, quantity in (("@Apple", 1), ("-Apple", 2)):
+            OrderItem.objects.create(
+                order=cls.order, product=apple, product_name=name,
+                quantity=quantity, price_at_order=10, line_total=10 * quantity,
+            )
+        cls.delivered = Order.objects.create(user=cls.admin, status="DELIVERED", **CHECKOUT)
+        OrderItem.objects.create(
+            order=cls.delivered, product=apple, product_name="Apple", quantity=1, price_at_order=10, line_total=10,
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def export(self, **params):
+        response = self.client.get("/api/admin/orders/export/", params)
+        self.assertEqual(response.status_code, 200)
+        return b"".join(response.streaming_content)
+
+    def test_csv_escapes_formulas_and_reads_back(self):
+        content = self.export(type="csv", status="PENDING")
+        text = content.decode()
+        self.assertIn("'=HYPERLINK", text)
+        self.assertIn("'+84900000000", text)
+        self.assertIn("'@Apple", text)
+
+        records = [record for _, record in iter_records(io.BytesIO(content), "csv")]
+        self.assertEqual([r["product_name"] for r in records], ["@Apple", "-Apple"])
+        self.assertEqual({r["customer_name"] for r in records}, {self.order.customer_name})
+        self.assertEqual({r["customer_phone"] for r in records}, {"+84900000000"})
+        self.assertEqual({r["order_id"] for r in records}, {str(self.order.pk)})
+
+    def test_jsonl_keeps_raw_values(self):
+        content = self.export(type="jsonl")
+        records = [json.loads(line) for line in content.decode().splitlines()]
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records[0]["customer_name"], self.order.customer_name)
+        self.assertEqual(records[0]["line_total"], "10.00")
+        self.assertEqual([r["order_id"] for r in records], [self.order.pk] * 2 + [self.delivered.pk])
+
+    def test_invalid_type(self):
+        response = self.client.get("/api/admin/orders/export/", {"type": "xlsx"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_command_writes_the_same_rows(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "orders.csv")
+            call_command("export_orders", output=path, status=["DELIVERED"], stderr=io.StringIO())
+            with open(path, "rb") as fh:
+                records = [record for _, record in iter_records(fh, "csv")]
+        self.assertEqual([r["order_id"] for r in records], [str(self.delivered.pk)])
+
+
+class AdminBulkStatusTests(TestCase):
+    """Bulk transitions move the eligible orders only, restock rejected ones and cost a fixed number of queries."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="admin", email="admin@example.com", password="pw", is_staff=True
+        )
+        category = Category.objects.create(name="Fruit", slug="fruit")
+        cls.apple = Product.objects.create(name="Apple", price=10, category=category, stock_quantity=0, is_in_stock=False)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def place(self, count, status="PENDING", quantity=2):
+        orders = []
+        for _ in range(count):
+            order = Order.objects.create(user=self.admin, status=status, **CHECKOUT)
+            OrderItem.objects.create(
+                order=order, product=self.apple, product_name="Apple",
+                quantity=quantity, price_at_order=10, line_total=10 * quantity,
+            )
+            orders.append(order)
+        return orders
+
+    def bulk(self, ids, status, **extra):
+        return self.client.post(
+            "/api/admin/orders/bulk-status/", {"ids": ids, "status": status, **extra}, format="json"
+        )
+
+    def statuses(self, orders):
+        return list(Order.objects.filter(pk__in=[o.pk for o in orders]).order_by("pk").values_list("status", flat=True))
+
+    def test_moves_eligible_orders_and_skips_the_rest(self):
+        pending = self.place(3)
+        delivered = self.place(1, status="DELIVERED")
+        ids = [o.pk for o in pending + delivered] + [999999]
+
+        response = self.bulk(ids, "CONFIRMED")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {"requested": 5, "updated": 3, "skipped": 2})
+        self.assertEqual(self.statuses(pending), ["CONFIRMED"] * 3)
+        self.assertEqual(self.statuses(delivered), ["DELIVERED"])
+
+    def test_reject_restocks_only_the_moved_orders(self):
+        pending = self.place(2)
+        shipped = self.place(1, status="SHIPPED")
+
+        response = self.bulk([o.pk for o in pending + shipped], "REJECTED", reject_reason="OUT_OF_STOCK")
+
+        self.assertEqual(response.data["updated"], 2)
+        self.assertEqual(self.statuses(shipped), ["SHIPPED"])
+        self.assertEqual(
+            set(Order.objects.filter(pk__in=[o.pk for o in pending]).values_list("status", "reject_reason")),
+            {("REJECTED", "OUT_OF_STOCK")},
+        )
+        self.apple.refresh_from_db()
+        self.assertEqual(self.apple.stock_quantity, 4)
+        self.assertTrue(self.apple.is_in_stock)
+
+        # already rejected: nothing moves, nothing is restocked twice
+        response = self.bulk([o.pk for o in pending], "REJECTED", reject_reason="OUT_OF_STOCK")
+        self.assertEqual(response.data["updated"], 0)
+        self.apple.refresh_from_db()
+        self.assertEqual(self.apple.stock_quantity, 4)
+
+    def test_query_count_does_not_grow_with_the_batch(self):
+        for status, extra in (("CONFIRMED", {}), ("REJECTED", {"reject_reason": "OTHER"})):
+            with self.subTest(status=status):
+                counts = []
+                for size in (2, 40):
+                    ids = [o.pk for o in self.place(size)]
+                    with CaptureQueriesContext(connection) as ctx:
+                        response = self.bulk(ids, status, **extra)
+                    self.assertEqual(response.data["updated"], size)
+                    counts.append(len(ctx.captured_queries))
+                self.assertEqual(counts[0], counts[1])
+
+    def test_invalid_requests(self):
+        ids = [o.pk for o in self.place(1)]
+        for payload in (
+            {"ids": ids, "status": "REJECTED"},        # reason required
+            {"ids": ids, "status": "CANCELLED"},       # customers cancel
+            {"ids": [], "status": "CONFIRMED"},
+            {"ids": list(range(1, 1002)), "status": "CONFIRMED"},
+            {"ids": ids, "status": "LOST"},
+        ):
+            with self.subTest(payload=payload["status"]):
+                response = self.client.post("/api/admin/orders/bulk-status/", payload, format="json")
+                self.assertEqual(response.status_code, 400)
+        self.assertEqual(Order.objects.get().status, "PENDING")
+
+    def test_admins_only(self):
+        ids = [o.pk for o in self.place(1)]
+        self.client.force_authenticate(User.objects.create_user(username="u", email="u@example.com", password="pw"))
+        self.assertEqual(self.bulk(ids, "CONFIRMED").status_code, 403)
@@ -0,0 +1,78 @@
+# orders/transitions.py
+"""
+Order status state machine.
+
+TRANSITIONS lists the statuses each status may move to. Changes are applied
+with one conditional UPDATE (`WHERE id IN (...) AND status IN (<allowed
+sources>)`), so concurrent edits cannot move an order along a path the table
+forbids, and hundreds of orders move in one statement. Orders that end up
+CANCELLED or REJECTED give their stock back with one aggregated update over
+their order lines (see products/stock.py).
+"""
+from __future__ import annotations
+
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from products.stock import release_stock
+
+from .models import Order, OrderItem, OrderStatus
+
+TRANSITIONS = {
+    OrderStatus.PENDING: {OrderStatus.CONFIRMED, OrderStatus.REJECTED, OrderStatus.CANCELLED},
+    OrderStatus.CONFIRMED: {OrderStatus.SHIPPED, OrderStatus.REJECTED},
+    OrderStatus.SHIPPED: {OrderStatus.DELIVERED},
+    OrderStatus.DELIVERED: set(),
+    OrderStatus.CANCELLED: set(),
+    OrderStatus.REJECTED: set(),
+}
+
+# Statuses whose orders no longer hold their stock
+RESTOCK_STATUSES = {OrderStatus.CANCELLED, OrderStatus.REJECTED}
+
+
+def can_transition(current, target) -> bool:
+    return target in TRANSITIONS.get(current, ())
+
+
+def allowed_sources(target) -> list[str]:
+    """Statuses an order may be in to move to `target`."""
+    return [status for status, targets in TRANSITIONS.items() if target in targets]
+
+
+def restock_orders(order_ids) -> None:
+    """Return the stock of `order_ids` with one aggregate read and one UPDATE."""
+    quantities = dict(
+        OrderItem.objects
+            .filter(order_id__in=order_ids)
+            .values("product_id")
+            .annotate(total=Sum("quantity"))
+            .order_by()
+            .values_list("product_id", "total")
+    )
+    release_stock(quantities)
+
+
+def transition_orders(order_ids, target, sources=None, **fields) -> int:
+    """
+    Move the orders of `order_ids` that are in one of `sources` (default: every
+    status allowed to reach `target`) to `target`, setting `fields` as well.
+    Returns how many moved; the others are left untouched.
+    """
+    sources = allowed_sources(target) if sources is None else [s for s in sources if can_transition(s, target)]
+    if not sources or not order_ids:
+        return 0
+    # queryset updates skip auto_now; updated_at feeds the analytics rollups
+    fields.update(status=target, updated_at=timezone.now())
+    eligible = Order.objects.filter(pk__in=order_ids, status__in=sources)
+    if target not in RESTOCK_STATUSES:
+        return eligible.update(**fields)
+
+    with transaction.atomic():
+        # the restock needs to know which orders moved
+        moved = list(eligible.select_for_update().order_by("pk").values_list("pk", flat=True))
+        if moved:
+            Order.objects.filter(pk__in=moved).update(**fields)
+            restock_orders(moved)
+    return len(moved)
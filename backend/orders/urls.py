@@ -3,6 +3,8 @@ from .views import (
     OrderListCreateAPIView,
     OrderRetrieveUpdateDestroyAPIView,
     AdminOrderListAPIView,
+    AdminOrderExportView,
+    AdminOrderBulkStatusView,
     AdminOrderDetailAPIView,
 )
 
@@ -13,5 +15,7 @@ urlpatterns = [
     path("api/orders/<int:pk>/", OrderRetrieveUpdateDestroyAPIView.as_view(), name="api_order_detail"),
 
     path("api/admin/orders/", AdminOrderListAPIView.as_view(), name="admin_order_list"),
+    path("api/admin/orders/bulk-status/", AdminOrderBulkStatusView.as_view(), name="admin_order_bulk_status"),
+    path("api/admin/orders/export/", AdminOrderExportView.as_view(), name="admin_order_export"),
     path("api/admin/orders/<int:pk>/", AdminOrderDetailAPIView.as_view(), name="admin_order_detail"),
 ]
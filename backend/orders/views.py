@@ -1,28 +1,64 @@
 # orders/views.py
 from decimal import Decimal
 from django.db import transaction
+from django.db.models import Count
 from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework.pagination import PageNumberPagination
 from django.shortcuts import get_object_or_404
 from coupons.models import Coupon
-from django.utils import timezone
 
 # Cookie-aware auth (reads httpOnly accessToken from cookies)
 from accounts.authentication import CookieJWTAuthentication
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from backend.pagination import CursorModePaginationMixin
+from backend.streaming import streaming_export
 
 from products.models import Product
+from products.stock import InsufficientStock, adjust_stock
+from . import idempotency
+from .exports import EXPORT_FIELDS, EXPORT_TYPES, export_rows
+from .filters import filter_orders
 from .models import Order, OrderItem, OrderStatus
 from .serializers import (
     OrderCreateSerializer,
     OrderSerializer,
+    OrderListSerializer,
     OrderCancelSerializer,
+    AdminOrderBulkStatusSerializer,
     AdminOrderUpdateSerializer,
 )
+from .transitions import transition_orders
 
 # Cart models as in your app
 from carts.models import Cart, CartItem
+from carts.services import invalidate_cart_summary
+
+
+class OrderPagination(CursorModePaginationMixin, PageNumberPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class OrderListingMixin:
+    """
+    Order listings return light rows (totals, status, item count) by default,
+    or full orders with their items prefetched when called with ?expand=items;
+    either way a page costs a fixed number of queries.
+    """
+    def expand_items(self) -> bool:
+        return "items" in self.request.query_params.get("expand", "").split(",")
+
+    def listing_queryset(self, queryset):
+        if self.expand_items():
+            return queryset.prefetch_related("items")
+        return queryset.annotate(item_count=Count("items"))
+
+    def listing_serializer_class(self):
+        return OrderSerializer if self.expand_items() else OrderListSerializer
 
 
 def get_unit_price(product: Product) -> Decimal:
@@ -30,18 +66,34 @@ def get_unit_price(product: Product) -> Decimal:
     return product.price
 
 
-class OrderListCreateAPIView(generics.ListCreateAPIView):
+class OrderListCreateAPIView(OrderListingMixin, generics.ListCreateAPIView):
     authentication_classes = [CookieJWTAuthentication, JWTAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = OrderPagination
 
     def get_queryset(self):
-        return Order.objects.filter(user=self.request.user).order_by("-created_at")
+        return self.listing_queryset(
+            Order.objects.filter(user=self.request.user).order_by("-created_at")
+        )
 
     def get_serializer_class(self):
-        return OrderSerializer if self.request.method == "GET" else OrderCreateSerializer
+        return self.listing_serializer_class() if self.request.method == "GET" else OrderCreateSerializer
 
     @transaction.atomic
     def create(self, request, *args, **kwargs):
+        key = request.headers.get(idempotency.HEADER)
+        if not key:
+            return self.place_order(request)
+
+        # retried checkouts replay the first response; see orders/idempotency.py
+        record, response = idempotency.claim(request, key)
+        if response is not None:
+            return response
+        response = self.place_order(request)
+        idempotency.store(record, response)
+        return response
+
+    def place_order(self, request):
         # 1. Validate data
         serializer = OrderCreateSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -52,13 +104,33 @@ class OrderListCreateAPIView(generics.ListCreateAPIView):
         except Cart.DoesNotExist:
             return Response({"detail": "Cart is empty."}, status=status.HTTP_400_BAD_REQUEST)
 
-        cart_items_qs = CartItem.objects.select_for_update().filter(cart=cart).select_related("product")
+        cart_items_qs = CartItem.objects.select_for_update().filter(cart=cart)
         cart_items = list(cart_items_qs)
 
         if not cart_items:
             return Response({"detail": "Cart is empty."}, status=status.HTTP_400_BAD_REQUEST)
 
-    
+        quantities, reserved = {}, {}
+        for ci in cart_items:
+            quantities[ci.product_id] = quantities.get(ci.product_id, 0) + int(ci.quantity)
+            reserved[ci.product_id] = reserved.get(ci.product_id, 0) + ci.reserved_quantity
+
+        # Take what the cart does not already hold with one conditional UPDATE
+        # and give back any surplus hold (products/stock.py); the products are
+        # locked in id order first, and a short line rejects the whole
+        # checkout instead of clamping stock to 0.
+        try:
+            adjust_stock(
+                take={pk: qty - reserved[pk] for pk, qty in quantities.items()},
+                give={pk: reserved[pk] - qty for pk, qty in quantities.items()},
+            )
+        except InsufficientStock as exc:
+            return Response(
+                {"detail": "Insufficient stock.", "items": exc.items},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        products = Product.objects.in_bulk(quantities)
+
         order = Order.objects.create(
             user=request.user,
             customer_name=validated.get("customer_name", ""),
@@ -71,21 +143,21 @@ class OrderListCreateAPIView(generics.ListCreateAPIView):
 
         subtotal = Decimal("0.00")
         snapshot_items = []
+        order_items = []
 
-        for ci in cart_items:
-            product = Product.objects.select_for_update().get(pk=ci.product.pk)
-            qty = int(ci.quantity)
+        for product_id, qty in quantities.items():
+            product = products[product_id]
             unit = Decimal(get_unit_price(product))
             line = unit * qty
 
-            OrderItem.objects.create(
+            order_items.append(OrderItem(
                 order=order,
                 product=product,
                 product_name=product.name,
                 quantity=qty,
                 price_at_order=unit,
                 line_total=line,
-            )
+            ))
 
             subtotal += line
             snapshot_items.append({
@@ -94,49 +166,21 @@ class OrderListCreateAPIView(generics.ListCreateAPIView):
                 "qty": qty,
                 "unit": str(unit),
             })
-            
-            if getattr(product, "stock_quantity", None) is not None:
-                new_stock = max(0, int(product.stock_quantity) - qty)
-                product.stock_quantity = new_stock
-                product.is_in_stock = new_stock > 0
-                product.save(update_fields=["stock_quantity", "is_in_stock"])
+
+        OrderItem.objects.bulk_create(order_items)
 
         discount_amount = Decimal("0.00")
         coupon_code = validated.get("coupon_code")
         applied_coupon = None
 
         if coupon_code:
-            try:
-               
-                coupon = Coupon.objects.select_for_update().get(code=coupon_code)
-                
-                
-                now = timezone.now()
-                if not coupon.is_active or coupon.expires_at < now:
-                    raise ValueError("Coupon expired")
-                if coupon.usage_limit is not None and coupon.times_used >= coupon.usage_limit:
-                    raise ValueError("Coupon usage limit reached")
-                if subtotal < coupon.min_purchase_amount:
-                    raise ValueError("Minimum purchase requirement not met")
-                
-                # Calculate Discount
-                calc_discount = (subtotal * coupon.discount_percent) / 100
-                if coupon.max_discount_amount:
-                    calc_discount = min(calc_discount, coupon.max_discount_amount)
-                
-                discount_amount = calc_discount
-                
-                # Update Coupon usage
-                coupon.times_used += 1
-                coupon.save()
+            # rules are read without a lock; the use itself is counted by one
+            # conditional UPDATE that re-checks activity, expiry and the limit
+            coupon = Coupon.objects.redeemable().filter(code=coupon_code).first()
+            if coupon and subtotal >= coupon.min_purchase_amount and Coupon.objects.redeem(coupon_code):
+                discount_amount = coupon.calculate_discount(subtotal)
                 applied_coupon = coupon
 
-            except Coupon.DoesNotExist:
-                # Optional: Fail the order OR just ignore the invalid code
-                pass 
-            except ValueError:
-                pass
-
         # 6. Finalize Order
         order.subtotal_amount = subtotal
         order.discount_amount = discount_amount
@@ -149,6 +193,7 @@ class OrderListCreateAPIView(generics.ListCreateAPIView):
 
         # 7. Clear Cart
         cart_items_qs.delete()
+        invalidate_cart_summary(request.user.pk)
 
         return Response(OrderSerializer(order).data, status=status.HTTP_201_CREATED)
 
@@ -159,36 +204,80 @@ class OrderRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = OrderSerializer
 
     def get_queryset(self):
-        return Order.objects.filter(user=self.request.user)
+        return Order.objects.filter(user=self.request.user).prefetch_related("items")
 
     def update(self, request, *args, **kwargs):
         instance = self.get_object()
         s = OrderCancelSerializer(data=request.data)
         s.is_valid(raise_exception=True)
 
-        if instance.status != OrderStatus.PENDING:
+        # only PENDING orders may be cancelled; the stock goes back in the same transaction
+        moved = transition_orders(
+            [instance.pk], OrderStatus.CANCELLED, sources=[OrderStatus.PENDING],
+            cancel_reason=s.validated_data["cancel_reason"],
+        )
+        if not moved:
             return Response({"detail": "This order cannot be cancelled."}, status=status.HTTP_403_FORBIDDEN)
-
-        instance.status = OrderStatus.CANCELLED
-        instance.cancel_reason = s.validated_data["cancel_reason"]
-        instance.save(update_fields=["status", "cancel_reason"])
+        instance.refresh_from_db()
         return Response(OrderSerializer(instance).data)
 
     def destroy(self, request, *args, **kwargs):
         return Response({"detail": "Deleting orders is not allowed."}, status=status.HTTP_405_METHOD_NOT_ALLOWED)
 
 
-class AdminOrderListAPIView(generics.ListAPIView):
+class AdminOrderListAPIView(OrderListingMixin, generics.ListAPIView):
     authentication_classes = [CookieJWTAuthentication, JWTAuthentication]
     permission_classes = [IsAuthenticated, IsAdminUser]
-    serializer_class = OrderSerializer
-    queryset = Order.objects.all().order_by("-created_at")
+    pagination_class = OrderPagination
+
+    def get_queryset(self):
+        queryset = filter_orders(Order.objects.all(), self.request.query_params)
+        return self.listing_queryset(queryset.order_by("-created_at"))
+
+    def get_serializer_class(self):
+        return self.listing_serializer_class()
+
+
+class AdminOrderBulkStatusView(APIView):
+    """
+    POST /api/admin/orders/bulk-status/ {"ids": [...], "status": "...", "reject_reason"?}
+    Move many orders at once with one conditional UPDATE; orders whose current
+    status may not move to the target are skipped (see orders/transitions.py).
+    """
+    authentication_classes = [CookieJWTAuthentication, JWTAuthentication]
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    def post(self, request):
+        s = AdminOrderBulkStatusSerializer(data=request.data)
+        s.is_valid(raise_exception=True)
+        ids = set(s.validated_data["ids"])
+        target = s.validated_data["status"]
+        fields = {"reject_reason": s.validated_data["reject_reason"]} if target == OrderStatus.REJECTED else {}
+
+        updated = transition_orders(ids, target, **fields)
+        return Response({"requested": len(ids), "updated": updated, "skipped": len(ids) - updated})
+
+
+class AdminOrderExportView(APIView):
+    """
+    GET /api/admin/orders/export/?type=csv|jsonl
+    Stream order lines for accounting; accepts the admin list filters
+    (status, created_after, created_before, ...; see orders/filters.py).
+    """
+    authentication_classes = [CookieJWTAuthentication, JWTAuthentication]
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    def get(self, request):
+        export_type = request.query_params.get("type", "csv")
+        if export_type not in EXPORT_TYPES:
+            return Response({"detail": "Invalid type (csv or jsonl)."}, status=status.HTTP_400_BAD_REQUEST)
+        return streaming_export(EXPORT_FIELDS, export_rows(request.query_params), export_type, "orders")
 
 
 class AdminOrderDetailAPIView(generics.RetrieveUpdateAPIView):
     authentication_classes = [CookieJWTAuthentication, JWTAuthentication]
     permission_classes = [IsAuthenticated, IsAdminUser]
-    queryset = Order.objects.all()
+    queryset = Order.objects.prefetch_related("items")
 
     def get_serializer_class(self):
         return AdminOrderUpdateSerializer if self.request.method in ["PUT", "PATCH"] else OrderSerializer
@@ -0,0 +1,69 @@
+# products/categories.py
+"""
+In-process map of category slugs/ids used to resolve the `?category=` filter
+without a database round trip. The map is rebuilt lazily whenever the shared
+Category version counter (backend/cache.py) moves, so a rename or delete in
+one worker is seen by all of them; Category signals also drop the local copy.
+
+Without a shared cache the counter cannot be trusted across workers, so
+`category_map()` reads the categories from the database instead. Callers
+that resolve many values (a request, an import) load the map once and pass
+it to `resolve_category_id` / `category_labels`.
+"""
+from __future__ import annotations
+import threading
+
+from backend.cache import get_model_versions, shared_cache_enabled
+
+_lock = threading.Lock()
+_state = {"version": None, "by_slug": {}, "ids": frozenset(), "labels": {}}
+
+
+def _read_state(version) -> dict:
+    from .models import Category
+
+    rows = list(Category.objects.values_list("id", "slug", "name"))
+    return {
+        "version": version,
+        "by_slug": {slug: pk for pk, slug, _ in rows if slug},
+        "ids": frozenset(pk for pk, _, _ in rows),
+        "labels": {pk: {"slug": slug, "name": name} for pk, slug, name in rows},
+    }
+
+
+def invalidate_category_map() -> None:
+    with _lock:
+        _state["version"] = None
+
+
+def category_map() -> dict:
+    """The current category map; at most one query."""
+    from .models import Category
+
+    if not shared_cache_enabled():
+        return _read_state(None)
+    version = get_model_versions([Category])[0]
+    with _lock:
+        if _state["version"] != version:
+            _state.update(_read_state(version))
+        return dict(_state)
+
+
+def category_labels(categories=None) -> dict:
+    """{category id: {"slug", "name"}} for every category."""
+    return (categories or category_map())["labels"]
+
+
+def resolve_category_id(value, categories=None) -> int | None:
+    """Category id for a slug or numeric id, or None if no such category exists."""
+    state = categories or category_map()
+    by_slug, ids = state["by_slug"], state["ids"]
+
+    value = str(value).strip()
+    if value in by_slug:
+        return by_slug[value]
+    try:
+        pk = int(value)
+    except (TypeError, ValueError):
+        return None
+    return pk if pk in ids else None
@@ -7,3 +7,24 @@ class FieldLengths:
     MAX_LENGTH = 255
     DECIMAL_MAX_DIGITS = 12
     DECIMAL_PLACES = 2
+
+
+class ReviewLimits:
+    # Latest reviews embedded in the product detail payload; the rest are
+    # served by the paginated /api/products/<slug>/reviews/ endpoint.
+    DETAIL_EMBEDDED = 5
+
+
+class FacetBuckets:
+    # Price histogram buckets (VND) as [lower, upper) pairs; None is unbounded.
+    PRICE = (
+        (None, Decimal("50000")),
+        (Decimal("50000"), Decimal("100000")),
+        (Decimal("100000"), Decimal("200000")),
+        (Decimal("200000"), Decimal("500000")),
+        (Decimal("500000"), None),
+    )
+    # "N stars & up" thresholds over Product.average_rating
+    RATING = (4, 3, 2, 1)
+    # Age (seconds) after which the materialized summary is recomputed live
+    SUMMARY_MAX_AGE = 60 * 30
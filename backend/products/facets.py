@@ -0,0 +1,111 @@
+# products/facets.py
+"""
+Facet counts for the public product list.
+
+All facets come from one grouped query: rows of the filtered catalog
+(without the category filter) are grouped by category and every other facet
+is a conditional COUNT in the same SELECT. The per-category totals give the
+category facet, and the selected category's row (or the sum of all rows)
+gives the price and rating facets. Unfiltered browsing is served from a
+materialized ProductFacetSummary refreshed periodically by Celery. There is
+no stock facet: the public catalog only lists in-stock products, so it
+would always equal the total.
+"""
+from __future__ import annotations
+from datetime import timedelta
+
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .categories import category_labels
+from .constants import FacetBuckets
+
+CATALOG_SUMMARY_KEY = "catalog"
+
+
+def public_catalog():
+    """Products visible in the public catalog."""
+    from .models import Product
+
+    return Product.objects.filter(is_in_stock=True, is_deleted=False)
+
+
+def _price_condition(lower, upper) -> Q:
+    condition = Q()
+    if lower is not None:
+        condition &= Q(price__gte=lower)
+    if upper is not None:
+        condition &= Q(price__lt=upper)
+    return condition
+
+
+def _facet_annotations() -> dict:
+    annotations = {
+        "total": Count("id"),
+    }
+    for i, (lower, upper) in enumerate(FacetBuckets.PRICE):
+        annotations[f"price_{i}"] = Count("id", filter=_price_condition(lower, upper))
+    for stars in FacetBuckets.RATING:
+        annotations[f"rating_{stars}"] = Count("id", filter=Q(average_rating__gte=stars))
+    return annotations
+
+
+def compute_facets(queryset, category_id=None, categories=None) -> dict:
+    """
+    Facet counts for `queryset`, which must carry every filter except the
+    category one; `category_id` is the selected category, if any, and
+    `categories` an already loaded category map (products/categories.py).
+    """
+    rows = queryset.order_by().values("category_id").annotate(**_facet_annotations())
+    labels = category_labels(categories)
+
+    categories = []
+    totals = dict.fromkeys(_facet_annotations(), 0)
+    for row in rows:
+        label = labels.get(row["category_id"])
+        if label is not None:
+            categories.append({"id": row["category_id"], **label, "count": row["total"]})
+        if category_id is None or row["category_id"] == category_id:
+            for key in totals:
+                totals[key] += row[key]
+    categories.sort(key=lambda item: (-item["count"], item["name"]))
+
+    return {
+        "total": totals["total"],
+        "categories": categories,
+        "price": [
+            {
+                "min": None if lower is None else str(lower),
+                "max": None if upper is None else str(upper),
+                "count": totals[f"price_{i}"],
+            }
+            for i, (lower, upper) in enumerate(FacetBuckets.PRICE)
+        ],
+        "rating": [
+            {"min": stars, "count": totals[f"rating_{stars}"]}
+            for stars in FacetBuckets.RATING
+        ],
+    }
+
+
+def refresh_facet_summary() -> dict:
+    """Recompute and store the unfiltered catalog facets."""
+    from .models import ProductFacetSummary
+
+    data = compute_facets(public_catalog())
+    ProductFacetSummary.objects.update_or_create(
+        key=CATALOG_SUMMARY_KEY,
+        defaults={"data": data, "refreshed_at": timezone.now()},
+    )
+    return data
+
+
+def catalog_facet_summary() -> dict:
+    """Materialized unfiltered facets, recomputed live when missing or too old."""
+    from .models import ProductFacetSummary
+
+    summary = ProductFacetSummary.objects.filter(key=CATALOG_SUMMARY_KEY).first()
+    max_age = timedelta(seconds=FacetBuckets.SUMMARY_MAX_AGE)
+    if summary is None or timezone.now() - summary.refreshed_at > max_age:
+        return refresh_facet_summary()
+    return summary.data
@@ -0,0 +1,209 @@
+# products/importer.py
+"""
+Bulk product import.
+
+Records (CSV or JSONL, see backend/streaming.py) are validated with the
+admin ProductCreateUpdateSerializer rules and written in chunks: one
+transaction per chunk, existing products matched by slug in one query,
+new slugs allocated for the whole chunk with one prefix query, then
+bulk_create / bulk_update for products and bulk_create for images. Per-row
+validation errors are collected and reported instead of aborting the file.
+"""
+from __future__ import annotations
+from itertools import islice
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+
+from backend.cache import bump_model_version
+from backend.slugs import allocate_slugs
+from backend.streaming import iter_records
+
+from .categories import category_map, resolve_category_id
+from .models import Category, Product, ProductImage
+from .search import build_search_document, update_search_vectors
+from .serializers import ProductCreateUpdateSerializer
+
+IMPORT_TYPES = ("csv", "jsonl")
+
+# Columns of the export, which the importer accepts back unchanged
+EXPORT_FIELDS = (
+    "slug", "name", "description", "price", "category",
+    "is_in_stock", "stock_quantity", "image_url",
+)
+
+# Tries per chunk when a write fails on a unique constraint
+CHUNK_ATTEMPTS = 2
+
+UPDATE_FIELDS = [
+    "name", "description", "price", "category", "is_in_stock",
+    "stock_quantity", "search_document", "primary_image_url", "updated_at",
+]
+
+
+class ProductImportRowSerializer(ProductCreateUpdateSerializer):
+    """
+    ProductCreateUpdateSerializer rules for one imported record. The category
+    is given by slug or id and resolved against the category map passed in
+    the "categories" context (loaded once per import), and the slug is an
+    optional identity (existing slug -> update) checked per batch rather than
+    per row.
+    """
+    category_id = None
+    category = serializers.CharField()
+    slug = serializers.SlugField(required=False, allow_blank=True)
+    # JSONL exports write a product without images as null
+    image_url = serializers.URLField(write_only=True, required=False, allow_blank=True, allow_null=True)
+
+    class Meta(ProductCreateUpdateSerializer.Meta):
+        fields = [
+            'name', 'slug', 'description', 'price', 'category',
+            'is_in_stock', 'stock_quantity', 'image_url',
+        ]
+        read_only_fields = []
+
+    def validate_category(self, value):
+        category_id = resolve_category_id(value, self.context["categories"])
+        if category_id is None:
+            raise serializers.ValidationError(_('Category does not exist.'))
+        return category_id
+
+
+class ImportReport:
+    def __init__(self):
+        self.rows = 0
+        self.created = 0
+        self.updated = 0
+        self.errors = []
+
+    def add_error(self, row, errors) -> None:
+        self.errors.append({"row": row, "errors": errors})
+
+    def as_dict(self) -> dict:
+        return {
+            "rows": self.rows,
+            "created": self.created,
+            "updated": self.updated,
+            "errors": self.errors,
+        }
+
+
+def _validated_rows(records, report):
+    context = {"categories": category_map()}
+    for row, record in records:
+        report.rows += 1
+        if record is None:
+            report.add_error(row, {"non_field_errors": ["Invalid record."]})
+            continue
+        serializer = ProductImportRowSerializer(data=record, context=context)
+        if serializer.is_valid():
+            yield row, serializer.validated_data
+        else:
+            report.add_error(row, serializer.errors)
+
+
+def _write_chunk(chunk) -> tuple[int, int, list]:
+    """Write one chunk in a transaction; returns (created, updated, row errors)."""
+    categories = Category.objects.in_bulk({data["category"] for _, data in chunk})
+    now = timezone.now()
+
+    with transaction.atomic():
+        given_slugs = [data["slug"] for _, data in chunk if data.get("slug")]
+        existing = Product.objects.in_bulk(given_slugs, field_name="slug") if given_slugs else {}
+
+        creates, updates, images, errors, seen = [], [], [], [], set()
+        for row, data in chunk:
+            slug = data.get("slug") or None
+            if slug and slug in seen:
+                errors.append((row, {"slug": ["Duplicate slug in the same batch."]}))
+                continue
+            if slug:
+                seen.add(slug)
+
+            product = existing.get(slug) if slug else None
+            if product is None:
+                product = Product(slug=slug)
+                creates.append(product)
+            else:
+                updates.append(product)
+
+            product.name = data["name"]
+            product.description = data.get("description", "")
+            product.price = data["price"]
+            product.category = categories[data["category"]]
+            product.stock_quantity = data.get("stock_quantity", 0)
+            product.is_in_stock = data.get("is_in_stock", True)
+            product.updated_at = now
+            product.search_document = build_search_document(product)
+            if data.get("image_url"):
+                product.primary_image_url = data["image_url"]
+                images.append((product, data["image_url"]))
+
+        unnamed = [product for product in creates if not product.slug]
+        for product, slug in zip(unnamed, allocate_slugs(
+            Product, [p.name for p in unnamed], fallback=Product.slug_fallback, taken=seen,
+        )):
+            product.slug = slug
+
+        Product.objects.bulk_create(creates)
+        Product.objects.bulk_update(updates, UPDATE_FIELDS)
+        # re-importing an export must not add the same image again
+        existing_images = set(
+            ProductImage.objects
+                .filter(product__in=updates, image_url__in={url for _, url in images})
+                .values_list("product_id", "image_url")
+        ) if updates and images else set()
+        ProductImage.objects.bulk_create(
+            ProductImage(product=product, image_url=url) for product, url in images
+            if (product.pk, url) not in existing_images
+        )
+        update_search_vectors(creates + updates)
+
+    return len(creates), len(updates), errors
+
+
+def import_products(fileobj, import_type: str, batch_size: int = 500) -> dict:
+    """Import a CSV/JSONL byte stream; returns a report with per-row errors."""
+    report = ImportReport()
+    rows = _validated_rows(iter_records(fileobj, import_type), report)
+    while True:
+        chunk = list(islice(rows, batch_size))
+        if not chunk:
+            break
+        for attempt in range(CHUNK_ATTEMPTS):
+            try:
+                created, updated, errors = _write_chunk(chunk)
+            except IntegrityError as exc:
+                # the chunk was rolled back; a concurrent insert may have taken
+                # one of its slugs, so allocate again before giving up
+                if attempt < CHUNK_ATTEMPTS - 1:
+                    continue
+                created, updated = 0, 0
+                errors = [(row, {"non_field_errors": [f"Database error: {exc}"]}) for row, _ in chunk]
+            report.created += created
+            report.updated += updated
+            for row, row_errors in errors:
+                report.add_error(row, row_errors)
+            break
+
+    if report.created or report.updated:
+        # bulk writes bypass the model signals
+        bump_model_version(Product)
+        bump_model_version(ProductImage)
+    return report.as_dict()
+
+
+def export_rows():
+    """Export rows (tuples in EXPORT_FIELDS order) streamed from the database."""
+    return (
+        Product.objects
+            .filter(is_deleted=False)
+            .order_by("id")
+            .values_list(
+                "slug", "name", "description", "price", "category__slug",
+                "is_in_stock", "stock_quantity", "primary_image_url",
+            )
+            .iterator(chunk_size=2000)
+    )
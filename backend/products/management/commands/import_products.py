@@ -0,0 +1,30 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from products.importer import IMPORT_TYPES, import_products
+
+class Command(BaseCommand):
+    help = 'Bulk import products from a CSV or JSONL file (existing slugs are updated)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--type', choices=IMPORT_TYPES,
+                            help='File type (default: from the file extension)')
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        import_type = options['type'] or options['path'].rsplit('.', 1)[-1].lower()
+        if import_type not in IMPORT_TYPES:
+            raise CommandError('Unknown file type; pass --type csv or --type jsonl')
+
+        with open(options['path'], 'rb') as fh:
+            report = import_products(fh, import_type, batch_size=options['batch_size'])
+
+        for error in report['errors']:
+            self.stderr.write(f"row {error['row']}: {json.dumps(error['errors'], ensure_ascii=False)}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {report['rows']} rows: {report['created']} created, "
+                f"{report['updated']} updated, {len(report['errors'])} errors"
+            )
+        )
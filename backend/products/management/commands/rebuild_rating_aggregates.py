@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from products.models import Product
+from products.ratings import rebuild_rating_aggregates
+
+class Command(BaseCommand):
+    help = 'Recompute stored average_rating / review_count / rating_distribution for products'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--product', type=int, action='append', dest='product_ids',
+                            help='Only rebuild this product id (repeatable)')
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        queryset = Product.objects.all()
+        if options['product_ids']:
+            queryset = queryset.filter(pk__in=options['product_ids'])
+        count = rebuild_rating_aggregates(queryset, batch_size=options['batch_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt rating aggregates for {count} products')
+        )
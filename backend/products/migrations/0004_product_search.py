@@ -0,0 +1,83 @@
+# Generated by Django 5.2.4 on 2026-10-16 23:23
+
+import unicodedata
+
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+# Frozen copies of products.search.fold / search_vector_expression as of this
+# migration; later changes there must not change what this backfill writes.
+
+
+def fold(text):
+    if not text:
+        return ""
+    text = text.replace("đ", "d").replace("Đ", "D")
+    decomposed = unicodedata.normalize("NFD", text)
+    stripped = "".join(ch for ch in decomposed if unicodedata.category(ch) != "Mn")
+    return " ".join(stripped.lower().split())
+
+
+# name, category and description lines of search_document, weighted A > B > C
+SEARCH_VECTOR_SQL = """
+    UPDATE products SET search_vector =
+        setweight(to_tsvector('simple', COALESCE(split_part(search_document, E'\\n', 1), '')), 'A')
+        || setweight(to_tsvector('simple', COALESCE(split_part(search_document, E'\\n', 2), '')), 'B')
+        || setweight(to_tsvector('simple', COALESCE(split_part(search_document, E'\\n', 3), '')), 'C')
+"""
+
+
+def backfill_search_documents(apps, schema_editor):
+    Product = apps.get_model('products', 'Product')
+    batch = []
+    for product in Product.objects.select_related('category').iterator(chunk_size=500):
+        product.search_document = "\n".join([
+            fold(product.name), fold(product.category.name), fold(product.description),
+        ])
+        batch.append(product)
+        if len(batch) >= 500:
+            Product.objects.bulk_update(batch, ['search_document'])
+            batch = []
+    if batch:
+        Product.objects.bulk_update(batch, ['search_document'])
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(SEARCH_VECTOR_SQL)
+
+
+def create_search_index(apps, schema_editor):
+    # GIN indexes are PostgreSQL-only; other backends use the Python search fallback
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS idx_products_search ON products USING gin (search_vector)'
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS idx_products_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0003_productquestion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='search_document',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        # the index goes first: PostgreSQL refuses CREATE INDEX on a table with
+        # pending trigger events from the backfill's updates in this transaction
+        migrations.RunPython(create_search_index, drop_search_index),
+        migrations.RunPython(backfill_search_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.4 on 2026-10-16 23:24
+
+from decimal import Decimal, ROUND_HALF_UP
+
+import products.ratings
+from django.db import migrations, models
+from django.db.models import Count
+
+# Frozen copy of products.ratings as of this migration; later changes there
+# must not change what this backfill writes.
+RATING_VALUES = (1, 2, 3, 4, 5)
+
+
+def backfill_rating_aggregates(apps, schema_editor):
+    Product = apps.get_model('products', 'Product')
+    ProductReview = apps.get_model('products', 'ProductReview')
+    histograms = {}
+    rows = ProductReview.objects.values('product_id', 'rating').annotate(n=Count('id')).order_by()
+    for row in rows:
+        if row['rating'] in RATING_VALUES:
+            histogram = histograms.setdefault(row['product_id'], {str(v): 0 for v in RATING_VALUES})
+            histogram[str(row['rating'])] += row['n']
+    for product_id, histogram in histograms.items():
+        count = sum(histogram.values())
+        total = sum(int(value) * n for value, n in histogram.items())
+        average = (Decimal(total) / count).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+        Product.objects.filter(pk=product_id).update(
+            rating_distribution=histogram, review_count=count, average_rating=average,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0004_product_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='average_rating',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=3, null=True),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_distribution',
+            field=models.JSONField(default=products.ratings.empty_distribution, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_rating_aggregates, migrations.RunPython.noop),
+    ]
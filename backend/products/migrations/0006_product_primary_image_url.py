@@ -0,0 +1,31 @@
+# Generated by Django 5.2.4 on 2026-10-16 23:25
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_primary_image_url(apps, schema_editor):
+    Product = apps.get_model('products', 'Product')
+    ProductImage = apps.get_model('products', 'ProductImage')
+    Product.objects.update(primary_image_url=Subquery(
+        ProductImage.objects
+            .filter(product=OuterRef('pk'))
+            .order_by('-created_at', '-id')
+            .values('image_url')[:1]
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0005_product_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='primary_image_url',
+            field=models.URLField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_primary_image_url, migrations.RunPython.noop),
+    ]
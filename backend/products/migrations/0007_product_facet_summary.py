@@ -0,0 +1,25 @@
+# Generated by Django 5.2.4 on 2026-10-16 23:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0006_product_primary_image_url'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductFacetSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=50, unique=True)),
+                ('data', models.JSONField(default=dict)),
+                ('refreshed_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'product_facet_summaries',
+            },
+        ),
+    ]
@@ -1,12 +1,17 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
-from django.utils.text import slugify
 from django.urls import reverse
+from backend.slugs import UniqueSlugMixin
 from .constants import FieldLengths
+from .ratings import empty_distribution
+from .search import build_search_document, update_search_vectors
 from django.conf import settings
 
 
 #-------- category --------
-class Category(models.Model):
+class Category(UniqueSlugMixin, models.Model):
+    slug_fallback = "category"
+
     name = models.CharField(max_length = FieldLengths.MAX_LENGTH)
     slug = models.SlugField(max_length = FieldLengths.MAX_LENGTH, unique=True, blank=True, db_index=True)
     description = models.TextField(blank=True)
@@ -23,7 +28,9 @@ class Category(models.Model):
 
 #-------- product --------
 
-class Product(models.Model):
+class Product(UniqueSlugMixin, models.Model):
+    slug_fallback = "product"
+
     name = models.CharField(max_length=FieldLengths.MAX_LENGTH)
     slug = models.SlugField(max_length=FieldLengths.MAX_LENGTH, unique=True, blank=True, db_index=True)
     description = models.TextField(blank=True)
@@ -38,27 +45,31 @@ class Product(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
-    def _generate_unique_slug(self):
-        """
-        Create a slug from the product name; append a numeric suffix if necessary
-        to keep it unique.
-        """
-        base = slugify(self.name) or "product"
-        slug_candidate = base
-        counter = 0
+    # Latest ProductImage.image_url, maintained by products/signals.py
+    primary_image_url = models.URLField(null=True, blank=True, editable=False)
 
-        # loop until unique (exclude self when updating)
-        while Product.objects.filter(slug=slug_candidate).exclude(pk=self.pk).exists():
-            counter += 1
-            slug_candidate = f"{base}-{counter}"
+    # Rating aggregates over reviews + ratings; see products/ratings.py
+    average_rating = models.DecimalField(max_digits=3, decimal_places=2, null=True, blank=True, editable=False)
+    review_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_distribution = models.JSONField(default=empty_distribution, editable=False)
 
-        return slug_candidate
+    # Maintained by save(); see products/search.py
+    search_document = models.TextField(blank=True, editable=False)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    SEARCH_SOURCE_FIELDS = {'name', 'description', 'category', 'category_id'}
 
     def save(self, *args, **kwargs):
-        # If slug is blank or empty, generate it from the name
-        if not self.slug or str(self.slug).strip() == "":
-            self.slug = self._generate_unique_slug()
+        # a blank slug is allocated by UniqueSlugMixin; see backend/slugs.py
+        update_fields = kwargs.get('update_fields')
+        refresh_search = update_fields is None or bool(self.SEARCH_SOURCE_FIELDS & set(update_fields))
+        if refresh_search:
+            self.search_document = build_search_document(self)
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'search_document'}
         super().save(*args, **kwargs)
+        if refresh_search:
+            update_search_vectors([self])
     class Meta:
         db_table = 'products'
         indexes = [
@@ -156,4 +167,17 @@ class ProductQuestion(models.Model):
         ]
 
     def __str__(self):
-        return f"Question by {self.author_name} on {self.product.name}"
\ No newline at end of file
+        return f"Question by {self.author_name} on {self.product.name}"
+#-------- product facet summary --------
+
+class ProductFacetSummary(models.Model):
+    """Precomputed catalog facet counts; refreshed by products.tasks.refresh_product_facets."""
+    key = models.CharField(max_length=50, unique=True)
+    data = models.JSONField(default=dict)
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'product_facet_summaries'
+
+    def __str__(self):
+        return f"Facet summary {self.key} ({self.refreshed_at:%Y-%m-%d %H:%M})"
@@ -0,0 +1,93 @@
+# products/ratings.py
+"""
+Denormalized rating aggregates on Product.
+
+`rating_distribution` holds a 1-5 histogram of the ProductReview rows;
+`review_count` and `average_rating` are derived from it, so they agree with
+the product's `reviews` list. Standalone ProductRating rows are not counted.
+Signals apply per-row deltas under a row lock, and `rebuild_rating_aggregates`
+recomputes everything in bulk (see the `rebuild_rating_aggregates` command).
+"""
+from __future__ import annotations
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.db import transaction
+from backend.cache import bump_model_version
+from django.db.models import Count
+
+RATING_VALUES = (1, 2, 3, 4, 5)
+
+
+def empty_distribution() -> dict:
+    return {str(value): 0 for value in RATING_VALUES}
+
+
+def aggregate_fields(distribution: dict) -> dict:
+    """Product field values for a rating histogram."""
+    distribution = {str(value): int(distribution.get(str(value), 0)) for value in RATING_VALUES}
+    count = sum(distribution.values())
+    average = None
+    if count:
+        total = sum(int(value) * n for value, n in distribution.items())
+        average = (Decimal(total) / count).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    return {
+        "rating_distribution": distribution,
+        "review_count": count,
+        "average_rating": average,
+    }
+
+
+def apply_rating_delta(product_id, rating, delta: int) -> None:
+    """Add `delta` (+1/-1) ratings of value `rating` to a product's histogram."""
+    from .models import Product
+
+    if product_id is None or rating not in RATING_VALUES:
+        return
+    with transaction.atomic():
+        product = (
+            Product.objects
+                .select_for_update()
+                .only("id", "rating_distribution")
+                .filter(pk=product_id)
+                .first()
+        )
+        if product is None:
+            # product is being deleted together with its reviews
+            return
+        distribution = {**empty_distribution(), **(product.rating_distribution or {})}
+        key = str(rating)
+        distribution[key] = max(0, int(distribution[key]) + delta)
+        Product.objects.filter(pk=product_id).update(**aggregate_fields(distribution))
+
+
+def rebuild_rating_aggregates(queryset=None, batch_size=500) -> int:
+    """Recompute aggregates for `queryset` (all products by default) with one grouped query."""
+    from .models import Product, ProductReview
+
+    products = queryset if queryset is not None else Product.objects.all()
+    histograms = {}
+    rows = (
+        ProductReview.objects
+            .filter(product__in=products)
+            .values("product_id", "rating")
+            .annotate(n=Count("id"))
+            .order_by()
+    )
+    for row in rows:
+        histogram = histograms.setdefault(row["product_id"], empty_distribution())
+        if row["rating"] in RATING_VALUES:
+            histogram[str(row["rating"])] += row["n"]
+
+    updated, total = [], 0
+    for product in products.only("id").iterator(chunk_size=batch_size):
+        total += 1
+        for field, value in aggregate_fields(histograms.get(product.pk, {})).items():
+            setattr(product, field, value)
+        updated.append(product)
+        if len(updated) >= batch_size:
+            Product.objects.bulk_update(updated, ["rating_distribution", "review_count", "average_rating"])
+            updated = []
+    if updated:
+        Product.objects.bulk_update(updated, ["rating_distribution", "review_count", "average_rating"])
+    bump_model_version(Product)
+    return total
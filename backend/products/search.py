@@ -0,0 +1,175 @@
+# products/search.py
+"""
+Product full-text search.
+
+Every product keeps an accent-folded `search_document` (name, category name
+and description, one per line) that is refreshed whenever the product or its
+category changes. On PostgreSQL the same text is also stored as a weighted
+`search_vector` (name > category > description) backed by a GIN index; other
+databases (SQLite in local test runs) use a pure-Python backend that filters
+on the folded document and ranks the candidates in Python.
+"""
+from __future__ import annotations
+import re
+import unicodedata
+
+from django.db import connection
+from django.db.models import Case, F, Func, IntegerField, TextField, Value, When
+
+WEIGHTS = ("A", "B", "C")  # name, category, description
+PYTHON_WEIGHTS = {"A": 1.0, "B": 0.4, "C": 0.1}
+
+_TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def fold(text: str | None) -> str:
+    """
+    Lowercase `text`, strip Vietnamese diacritics (including đ/Đ) and
+    collapse whitespace, e.g. "Cà Chua  Đà Lạt" -> "ca chua da lat".
+    """
+    if not text:
+        return ""
+    text = text.replace("đ", "d").replace("Đ", "D")
+    decomposed = unicodedata.normalize("NFD", text)
+    stripped = "".join(ch for ch in decomposed if unicodedata.category(ch) != "Mn")
+    return " ".join(stripped.lower().split())
+
+
+def tokenize(text: str | None) -> list[str]:
+    return _TOKEN_RE.findall(fold(text))
+
+
+def build_search_document(product) -> str:
+    category = getattr(product, "category", None)
+    return "\n".join([
+        fold(product.name),
+        fold(category.name if category else ""),
+        fold(product.description),
+    ])
+
+
+def _document_parts(document: str) -> tuple[str, str, str]:
+    parts = (document or "").split("\n", 2)
+    parts += [""] * (3 - len(parts))
+    return parts[0], parts[1], parts[2]
+
+
+def search_vector_expression():
+    """
+    Weighted tsvector computed from the stored `search_document` column, so
+    vectors for any number of rows can be written with a single UPDATE.
+    """
+    from django.contrib.postgres.search import SearchVector
+
+    vector = None
+    for position, weight in enumerate(WEIGHTS, start=1):
+        part = SearchVector(
+            Func(
+                F("search_document"), Value("\n"), Value(position),
+                function="split_part", output_field=TextField(),
+            ),
+            weight=weight,
+            config="simple",
+        )
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def update_search_vectors(products) -> None:
+    """Write `search_vector` for already-saved products (PostgreSQL only)."""
+    if connection.vendor != "postgresql":
+        return
+    from .models import Product
+
+    Product.objects.filter(pk__in=[p.pk for p in products]).update(
+        search_vector=search_vector_expression()
+    )
+
+
+def refresh_search_documents(queryset) -> int:
+    """Rebuild the search document (and vector) of every product in `queryset`."""
+    from .models import Product
+
+    products = list(queryset.select_related("category"))
+    for product in products:
+        product.search_document = build_search_document(product)
+    Product.objects.bulk_update(products, ["search_document"], batch_size=500)
+    update_search_vectors(products)
+    return len(products)
+
+
+# -------- backends --------
+class PostgresSearchBackend:
+    """tsvector/tsquery search over the GIN-indexed `search_vector`."""
+
+    def search(self, queryset, query: str):
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        terms = tokenize(query)
+        if not terms:
+            return queryset.none()
+        # prefix match on every term so partial words work for instant search
+        tsquery = SearchQuery(
+            " & ".join(f"{term}:*" for term in terms),
+            search_type="raw",
+            config="simple",
+        )
+        return (
+            queryset
+                .filter(search_vector=tsquery)
+                .annotate(search_rank=SearchRank(F("search_vector"), tsquery))
+                .order_by("-search_rank", "-created_at")
+        )
+
+
+class PythonSearchBackend:
+    """
+    Fallback for databases without full-text search: candidates are filtered
+    with LIKE on the folded document, then ranked in Python using the same
+    name > category > description weighting.
+    """
+
+    def search(self, queryset, query: str):
+        terms = tokenize(query)
+        if not terms:
+            return queryset.none()
+
+        candidates = queryset
+        for term in terms:
+            candidates = candidates.filter(search_document__contains=term)
+
+        ranked = sorted(
+            candidates.values_list("pk", "search_document", "created_at"),
+            key=lambda row: (self.rank(row[1], terms), row[2]),
+            reverse=True,
+        )
+        if not ranked:
+            return queryset.none()
+
+        positions = [When(pk=pk, then=Value(i)) for i, (pk, _, _) in enumerate(ranked)]
+        return (
+            queryset
+                .filter(pk__in=[pk for pk, _, _ in ranked])
+                .annotate(search_rank=Case(*positions, output_field=IntegerField()))
+                .order_by("search_rank")
+        )
+
+    @staticmethod
+    def rank(document: str, terms: list[str]) -> float:
+        score = 0.0
+        for text, weight in zip(_document_parts(document), WEIGHTS):
+            words = text.split()
+            for term in terms:
+                score += PYTHON_WEIGHTS[weight] * sum(1 for word in words if word.startswith(term))
+        return score
+
+
+def get_search_backend():
+    if connection.vendor == "postgresql":
+        return PostgresSearchBackend()
+    return PythonSearchBackend()
+
+
+def search_products(queryset, query: str):
+    """Filter `queryset` to products matching `query`, best matches first."""
+    return get_search_backend().search(queryset, query)
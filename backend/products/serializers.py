@@ -4,9 +4,10 @@ from decimal import Decimal
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
-from django.db.models import Avg
 from django.db import transaction
 from .models import Category, Product, ProductReview, ProductImage, ProductRating, ProductQuestion
+from .constants import ReviewLimits
+from .ratings import RATING_VALUES
 
 
 # -------- Category Serializers --------
@@ -83,8 +84,8 @@ class ProductListSerializer(serializers.ModelSerializer):
         write_only=True
     )
 
-    # These fields are expected to be provided by queryset annotations
-    primary_image = serializers.CharField(read_only=True, allow_null=True)
+    # primary image and ratings are stored on Product
+    primary_image = serializers.CharField(source='primary_image_url', read_only=True, allow_null=True)
     average_rating = serializers.SerializerMethodField()
     review_count = serializers.IntegerField(read_only=True)
 
@@ -99,7 +100,7 @@ class ProductListSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'slug', 'created_at']
 
     def get_average_rating(self, obj):
-        # Use annotated value if present (DB does the aggregation)
+        # Stored aggregate, maintained by products/ratings.py
         avg = getattr(obj, 'average_rating', None)
         if avg is None:
             return None
@@ -117,7 +118,7 @@ class ProductDetailSerializer(serializers.ModelSerializer):
         write_only=True
     )
     images = ProductImageSerializer(many=True, read_only=True)
-    reviews = ProductReviewListSerializer(many=True, read_only=True)
+    reviews = serializers.SerializerMethodField()
     average_rating = serializers.SerializerMethodField()
     review_count = serializers.SerializerMethodField()
     rating_distribution = serializers.SerializerMethodField()
@@ -132,28 +133,26 @@ class ProductDetailSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'slug', 'created_at', 'updated_at']
 
+    def get_reviews(self, obj):
+        # Latest reviews only; `latest_reviews` is prefetched by the detail views
+        reviews = getattr(obj, 'latest_reviews', None)
+        if reviews is None:
+            reviews = obj.reviews.select_related('user')[:ReviewLimits.DETAIL_EMBEDDED]
+        return ProductReviewListSerializer(reviews, many=True).data
+
     def get_average_rating(self, obj):
-        # For detail view fallback to DB aggregation if not annotated
-        avg = getattr(obj, 'average_rating', None)
-        if avg is None:
-            avg = obj.reviews.aggregate(avg=Avg('rating')).get('avg')
-        if avg is None:
+        # Stored aggregate, maintained by products/ratings.py
+        if obj.average_rating is None:
             return None
-        return round(float(avg), 1)
+        return round(float(obj.average_rating), 1)
 
     def get_review_count(self, obj):
-        count = getattr(obj, 'review_count', None)
-        if count is None:
-            return obj.reviews.count()
-        return count
+        return obj.review_count
 
     def get_rating_distribution(self, obj):
-        # Avoid iterating .reviews in list view; detail view can compute it
-        qs = obj.reviews.all()
-        distribution = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
-        for r in qs:
-            distribution[r.rating] = distribution.get(r.rating, 0) + 1
-        return distribution
+        # Stored 1-5 histogram (JSON keys are strings)
+        stored = obj.rating_distribution or {}
+        return {value: int(stored.get(str(value), 0)) for value in RATING_VALUES}
 
 
 class ProductCreateUpdateSerializer(serializers.ModelSerializer):
@@ -195,6 +194,8 @@ class ProductCreateUpdateSerializer(serializers.ModelSerializer):
             product = super().create(validated_data)
             if image_url:
                 ProductImage.objects.create(product=product, image_url=image_url)
+                # the ProductImage signal updates the row; keep the instance in sync
+                product.primary_image_url = image_url
         return product
 
     def update(self, instance, validated_data):
@@ -203,6 +204,8 @@ class ProductCreateUpdateSerializer(serializers.ModelSerializer):
             product = super().update(instance, validated_data)
             if image_url:
                 ProductImage.objects.create(product=product, image_url=image_url)
+                # the ProductImage signal updates the row; keep the instance in sync
+                product.primary_image_url = image_url
         return product
 
 
@@ -267,6 +270,4 @@ class AdminProductQuestionSerializer(serializers.ModelSerializer):
         ]
 
     def get_product_image(self, obj):
-        # Fetch the first image URL if it exists
-        img = obj.product.images.first()
-        return img.image_url if img else None
+        return obj.product.primary_image_url
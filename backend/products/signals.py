@@ -0,0 +1,83 @@
+# products/signals.py
+from __future__ import annotations
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from backend.cache import bump_version_on_change
+from .categories import invalidate_category_map
+from .models import Category, Product, ProductImage, ProductRating, ProductReview
+from .ratings import apply_rating_delta
+from .search import refresh_search_documents
+
+
+@receiver(post_save, sender=Category)
+def refresh_category_products_search(sender, instance, created, update_fields=None, **kwargs):
+    # The category name is part of every product's search document
+    if created or (update_fields is not None and 'name' not in update_fields):
+        return
+    refresh_search_documents(instance.products.all())
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def drop_category_map(sender, **kwargs):
+    invalidate_category_map()
+
+
+# -------- rating aggregates --------
+def _remember_previous_rating(sender, instance, **kwargs):
+    previous = None
+    if instance.pk:
+        previous = sender.objects.filter(pk=instance.pk).values('product_id', 'rating').first()
+    instance._previous_rating = previous
+
+
+def _apply_saved_rating(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_previous_rating', None)
+    if previous == {'product_id': instance.product_id, 'rating': instance.rating}:
+        return
+    if previous:
+        apply_rating_delta(previous['product_id'], previous['rating'], -1)
+    apply_rating_delta(instance.product_id, instance.rating, +1)
+    instance._previous_rating = {'product_id': instance.product_id, 'rating': instance.rating}
+
+
+def _apply_deleted_rating(sender, instance, **kwargs):
+    apply_rating_delta(instance.product_id, instance.rating, -1)
+
+
+pre_save.connect(_remember_previous_rating, sender=ProductReview)
+post_save.connect(_apply_saved_rating, sender=ProductReview)
+post_delete.connect(_apply_deleted_rating, sender=ProductReview)
+
+
+# -------- primary image --------
+def refresh_primary_image(product_id) -> None:
+    latest = (
+        ProductImage.objects
+            .filter(product_id=product_id)
+            .order_by('-created_at', '-id')
+            .values_list('image_url', flat=True)
+            .first()
+    )
+    Product.objects.filter(pk=product_id).update(primary_image_url=latest)
+
+
+@receiver(post_save, sender=ProductImage)
+def set_primary_image(sender, instance, created, **kwargs):
+    if created:
+        # the newest image is always the primary one
+        Product.objects.filter(pk=instance.product_id).update(primary_image_url=instance.image_url)
+    else:
+        refresh_primary_image(instance.product_id)
+
+
+@receiver(post_delete, sender=ProductImage)
+def unset_primary_image(sender, instance, **kwargs):
+    refresh_primary_image(instance.product_id)
+
+
+# -------- response cache versions --------
+for _model in (Product, Category, ProductImage, ProductReview, ProductRating):
+    post_save.connect(bump_version_on_change, sender=_model)
+    post_delete.connect(bump_version_on_change, sender=_model)
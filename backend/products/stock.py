@@ -0,0 +1,142 @@
+# products/stock.py
+"""
+Stock reservation without read-modify-write.
+
+`reserve_stock` takes stock for several products with one conditional
+UPDATE (`stock_quantity >= n` per row) that also derives `is_in_stock`, so
+concurrent buyers never oversell. If any row fails its condition the whole
+reservation is rolled back and `InsufficientStock` lists the short lines.
+`release_stock` gives stock back (cancelled orders, expired cart
+reservations), and `adjust_stock` does both in one transaction.
+
+A multi-row UPDATE locks its rows in whatever order the plan visits them,
+so every writer first locks the affected products `ORDER BY id`: two
+transactions touching overlapping product sets then queue up instead of
+deadlocking.
+"""
+from __future__ import annotations
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import BooleanField, Case, F, PositiveIntegerField, Q, Value, When
+
+from backend.cache import bump_model_version
+
+
+class InsufficientStock(Exception):
+    def __init__(self, items):
+        super().__init__("Insufficient stock")
+        # [{"product_id", "name", "requested", "available"}]
+        self.items = items
+
+
+def _bump_after_commit() -> None:
+    # queryset updates skip the model signals
+    from .models import Product
+
+    transaction.on_commit(lambda: bump_model_version(Product))
+
+
+def _lock(ids) -> None:
+    """Row-lock the products in id order (see the module docstring)."""
+    from .models import Product
+
+    list(
+        Product.objects
+            .select_for_update()
+            .filter(pk__in=ids)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+    )
+
+
+def _shortages(quantities: dict) -> list[dict]:
+    from .models import Product
+
+    rows = {
+        pk: (name, stock, is_deleted)
+        for pk, name, stock, is_deleted in Product.objects
+            .filter(pk__in=quantities)
+            .values_list("pk", "name", "stock_quantity", "is_deleted")
+    }
+    shortages = []
+    for pk, qty in sorted(quantities.items()):
+        name, stock, is_deleted = rows.get(pk, (None, 0, True))
+        available = 0 if is_deleted else stock
+        if available < qty:
+            shortages.append({"product_id": pk, "name": name, "requested": qty, "available": available})
+    return shortages
+
+
+def reserve_stock(quantities: dict) -> None:
+    """
+    Take `quantities` ({product id: n}) out of stock atomically, or raise
+    InsufficientStock and change nothing.
+    """
+    from .models import Product
+
+    quantities = {pk: qty for pk, qty in quantities.items() if qty > 0}
+    if not quantities:
+        return
+    condition = reduce(or_, (
+        Q(pk=pk, stock_quantity__gte=qty) for pk, qty in quantities.items()
+    ))
+    with transaction.atomic():
+        _lock(quantities)
+        updated = (
+            Product.objects
+                .filter(condition, is_deleted=False)
+                .update(
+                    stock_quantity=Case(
+                        *[When(pk=pk, then=F("stock_quantity") - qty) for pk, qty in quantities.items()],
+                        default=F("stock_quantity"),
+                        output_field=PositiveIntegerField(),
+                    ),
+                    # evaluated against the pre-update row
+                    is_in_stock=Case(
+                        *[When(pk=pk, then=Q(stock_quantity__gt=qty)) for pk, qty in quantities.items()],
+                        default=F("is_in_stock"),
+                        output_field=BooleanField(),
+                    ),
+                )
+        )
+        if updated != len(quantities):
+            # roll back the rows that did fit, then report from committed values
+            transaction.set_rollback(True)
+    if updated != len(quantities):
+        raise InsufficientStock(_shortages(quantities))
+    _bump_after_commit()
+
+
+def release_stock(quantities: dict) -> None:
+    """Return `quantities` ({product id: n}) to stock with one UPDATE."""
+    from .models import Product
+
+    quantities = {pk: qty for pk, qty in quantities.items() if qty > 0}
+    if not quantities:
+        return
+    with transaction.atomic():
+        _lock(quantities)
+        Product.objects.filter(pk__in=quantities).update(
+            stock_quantity=Case(
+                *[When(pk=pk, then=F("stock_quantity") + qty) for pk, qty in quantities.items()],
+                default=F("stock_quantity"),
+                output_field=PositiveIntegerField(),
+            ),
+            is_in_stock=Value(True),
+        )
+    _bump_after_commit()
+
+
+def adjust_stock(take: dict, give: dict) -> None:
+    """
+    `reserve_stock(take)` and `release_stock(give)` in one transaction, with
+    the union of both product sets locked in id order first.
+    """
+    take = {pk: qty for pk, qty in take.items() if qty > 0}
+    give = {pk: qty for pk, qty in give.items() if qty > 0}
+    with transaction.atomic():
+        _lock(set(take) | set(give))
+        reserve_stock(take)
+        release_stock(give)
@@ -0,0 +1,149 @@
+# products/suggest.py
+"""
+In-memory prefix index for instant-search suggestions.
+
+Product and category names are accent-folded and tokenized (see
+products/search.py); every token is kept in a sorted list so all entries
+with a token starting with a given prefix are found with two bisections.
+Each worker builds its index from the database and rebuilds it lazily, on
+the first lookup after the indexed rows changed: at most once every
+VERSION_CHECK_INTERVAL seconds it compares the shared Product/Category
+version counters (backend/cache.py) with the ones it was built at, or,
+without a shared cache, a (row count, latest updated_at) fingerprint of both
+tables. Saves never touch the index.
+"""
+from __future__ import annotations
+import bisect
+import heapq
+import threading
+import time
+
+from django.db.models import Count, Max
+
+from backend.cache import get_model_versions, shared_cache_enabled
+
+from .search import fold, tokenize
+
+PRODUCT = "product"
+CATEGORY = "category"
+
+# How often (seconds) a worker checks whether the indexed rows changed
+VERSION_CHECK_INTERVAL = 1.0
+
+
+class PrefixIndex:
+    def __init__(self, entries=()):
+        self.entries = {}   # (kind, id) -> {"type", "id", "name", "slug"}
+        self.folded = {}    # (kind, id) -> folded name
+        self.words = {}     # (kind, id) -> folded name tokens
+        self.tokens = []    # sorted [(token, kind, id)]
+        for kind, pk, name, slug in entries:
+            self._store(kind, pk, name, slug)
+            for token in set(tokenize(name)):
+                self.tokens.append((token, kind, pk))
+        self.tokens.sort()
+
+    def _store(self, kind, pk, name, slug):
+        self.entries[(kind, pk)] = {"type": kind, "id": pk, "name": name, "slug": slug}
+        self.folded[(kind, pk)] = fold(name)
+        self.words[(kind, pk)] = tokenize(name)
+
+    def _prefix_range(self, prefix) -> tuple[int, int]:
+        lo = bisect.bisect_left(self.tokens, (prefix,))
+        hi = bisect.bisect_left(self.tokens, (prefix + "\uffff",))
+        return lo, hi
+
+    def search(self, query: str, limit: int = 8) -> list[dict]:
+        terms = tokenize(query)
+        if not terms:
+            return []
+        # scan the narrowest prefix range, then check the other terms per entry
+        ranges = sorted(
+            ((self._prefix_range(term), term) for term in terms),
+            key=lambda item: item[0][1] - item[0][0],
+        )
+        (lo, hi), _ = ranges[0]
+        others = [term for _, term in ranges[1:]]
+
+        matches = set()
+        for _, kind, pk in self.tokens[lo:hi]:
+            key = (kind, pk)
+            if key in matches:
+                continue
+            words = self.words[key]
+            if all(any(word.startswith(term) for word in words) for term in others):
+                matches.add(key)
+
+        folded_query = fold(query)
+        ranked = heapq.nsmallest(
+            limit,
+            matches,
+            key=lambda key: (
+                not self.folded[key].startswith(folded_query),
+                key[0] != CATEGORY,
+                len(self.folded[key]),
+                self.folded[key],
+            ),
+        )
+        return [self.entries[key] for key in ranked]
+
+
+
+# -------- per-process state --------
+_lock = threading.Lock()
+_state = {"index": None, "version": None, "checked_at": 0.0}
+
+
+def index_version():
+    """Identity of the indexed rows; changes whenever a product or category does."""
+    from .models import Category, Product
+
+    if shared_cache_enabled():
+        return tuple(get_model_versions([Product, Category]))
+    # per-worker counters miss other workers' saves, so ask the database
+    return tuple(
+        tuple(model.objects.aggregate(count=Count("id"), latest=Max("updated_at")).values())
+        for model in (Product, Category)
+    )
+
+
+def build_index_from_db() -> PrefixIndex:
+    from .models import Category, Product
+
+    entries = [
+        (CATEGORY, pk, name, slug)
+        for pk, name, slug in Category.objects.values_list("id", "name", "slug")
+    ]
+    entries += [
+        (PRODUCT, pk, name, slug)
+        for pk, name, slug in Product.objects.filter(is_deleted=False).values_list("id", "name", "slug")
+    ]
+    return PrefixIndex(entries)
+
+
+def get_index() -> PrefixIndex:
+    now = time.monotonic()
+    with _lock:
+        index = _state["index"]
+        if index is not None and now - _state["checked_at"] < VERSION_CHECK_INTERVAL:
+            return index
+        _state["checked_at"] = now
+    # read the version before the rows, so a change made mid-build is seen next time
+    version = index_version()
+    with _lock:
+        if _state["index"] is not None and _state["version"] == version:
+            return _state["index"]
+    index = build_index_from_db()
+    with _lock:
+        _state.update(index=index, version=version)
+    return index
+
+
+def invalidate_index() -> None:
+    """Make the next lookup re-check the version."""
+    with _lock:
+        _state["checked_at"] = 0.0
+
+
+def suggest(query: str, limit: int = 8) -> list[dict]:
+    return get_index().search(query, limit)
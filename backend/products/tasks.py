@@ -0,0 +1,7 @@
+from celery import shared_task
+
+from .facets import refresh_facet_summary
+
+@shared_task
+def refresh_product_facets():
+    refresh_facet_summary()
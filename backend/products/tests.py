@@ -1,3 +1,330 @@
-from django.test import TestCase
+import io
+from decimal import Decimal
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from backend.cache import bump_model_version
+
+from rest_framework.test import APIClient
+
+from users.models import User
+
+from .categories import invalidate_category_map, resolve_category_id
+from .importer import import_products
+from .models import Category, Product, ProductRating, ProductReview
+from .ratings import rebuild_rating_aggregates
+from .stock import InsufficientStock, adjust_stock, reserve_stock
+from .suggest import invalidate_index, suggest
+
+
+@override_settings(CACHE_SHARED=True)
+class CategoryFilterQueryCountTests(TestCase):
+    """The ?category= filter resolves from the in-process map: one count + one data query."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.fruit = Category.objects.create(name="Fruit", slug="fruit")
+        cls.vegetables = Category.objects.create(name="Vegetables", slug="vegetables")
+        for i in range(3):
+            Product.objects.create(name=f"Apple {i}", price=10, category=cls.fruit, stock_quantity=5)
+        Product.objects.create(name="Kale", price=5, category=cls.vegetables, stock_quantity=5)
+
+    def setUp(self):
+        cache.clear()
+        invalidate_category_map()
+
+    def list_products(self, category, queries):
+        # a fresh Product version skips the response cache but keeps the category map
+        bump_model_version(Product)
+        with self.assertNumQueries(queries):
+            response = self.client.get("/api/products/", {"category": category})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_cold_map_costs_one_extra_query(self):
+        data = self.list_products("fruit", 3)
+        self.assertEqual(data["count"], 3)
+
+    def test_slug(self):
+        resolve_category_id("fruit")
+        data = self.list_products("fruit", 2)
+        self.assertEqual(data["count"], 3)
+
+    def test_id(self):
+        resolve_category_id("fruit")
+        data = self.list_products(str(self.vegetables.pk), 2)
+        self.assertEqual(data["count"], 1)
+
+    def test_unknown_category_runs_no_query(self):
+        resolve_category_id("fruit")
+        data = self.list_products("no-such-category", 0)
+        self.assertEqual(data["count"], 0)
+
+
+@override_settings(CACHE_SHARED=False)
+class UnsharedCategoryMapTests(TestCase):
+    """Without a shared cache the category map is read once per request or import."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.fruit = Category.objects.create(name="Fruit", slug="fruit")
+        Category.objects.create(name="Vegetables", slug="vegetables")
+        Product.objects.create(name="Apple", price=10, category=cls.fruit, stock_quantity=5)
+
+    def category_reads(self, queries):
+        return [q for q in queries if 'FROM "categories"' in q["sql"]]
+
+    def test_list_with_facets(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/api/products/", {"category": "fruit", "facets": "1"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(len(self.category_reads(ctx.captured_queries)), 1)
+
+    def import_category_reads(self, rows):
+        lines = ["name,price,category,stock_quantity,image_url"]
+        lines += [f"Pear {i},5,{'fruit' if i % 2 else 'vegetables'},3,https://example.com/{i}.jpg" for i in range(rows)]
+        with CaptureQueriesContext(connection) as ctx:
+            report = import_products(io.BytesIO("\n".join(lines).encode()), "csv")
+        self.assertEqual(report["errors"], [])
+        self.assertEqual(report["created"], rows)
+        return len(self.category_reads(ctx.captured_queries))
+
+    def test_import_reads_categories_a_fixed_number_of_times(self):
+        self.assertEqual(self.import_category_reads(2), self.import_category_reads(30))
+
+
+class ReserveStockTests(TestCase):
+    """The conditional UPDATE never takes stock below zero and never half-applies."""
+
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(name="Fruit", slug="fruit")
+        cls.apple = Product.objects.create(name="Apple", price=10, category=category, stock_quantity=3)
+        cls.kale = Product.objects.create(name="Kale", price=5, category=category, stock_quantity=1)
+
+    def stock(self):
+        return dict(Product.objects.values_list("name", "stock_quantity"))
+
+    def test_reserve_to_zero(self):
+        reserve_stock({self.apple.pk: 3, self.kale.pk: 1})
+        self.assertEqual(self.stock(), {"Apple": 0, "Kale": 0})
+        self.assertFalse(Product.objects.filter(is_in_stock=True).exists())
+
+    def test_shortage_changes_nothing(self):
+        with self.assertRaises(InsufficientStock) as raised:
+            reserve_stock({self.apple.pk: 2, self.kale.pk: 2})
+        self.assertEqual(raised.exception.items, [
+            {"product_id": self.kale.pk, "name": "Kale", "requested": 2, "available": 1},
+        ])
+        # the apple line fitted but is rolled back with the rest
+        self.assertEqual(self.stock(), {"Apple": 3, "Kale": 1})
+
+    def test_sold_out_product_is_refused(self):
+        reserve_stock({self.kale.pk: 1})
+        with self.assertRaises(InsufficientStock):
+            reserve_stock({self.kale.pk: 1})
+        self.assertEqual(self.stock()["Kale"], 0)
+
+    def test_deleted_product_is_refused(self):
+        Product.objects.filter(pk=self.apple.pk).update(is_deleted=True)
+        with self.assertRaises(InsufficientStock) as raised:
+            reserve_stock({self.apple.pk: 1})
+        self.assertEqual(raised.exception.items[0]["available"], 0)
+        self.assertEqual(self.stock()["Apple"], 3)
+
+    def test_adjust_gives_back_only_if_the_take_fits(self):
+        with self.assertRaises(InsufficientStock):
+            adjust_stock(take={self.kale.pk: 5}, give={self.apple.pk: 1})
+        self.assertEqual(self.stock(), {"Apple": 3, "Kale": 1})
+        adjust_stock(take={self.kale.pk: 1}, give={self.apple.pk: 1})
+        self.assertEqual(self.stock(), {"Apple": 4, "Kale": 0})
+
+
+class RatingAggregateTests(TestCase):
+    """review_count / average_rating / rating_distribution follow the reviews only."""
+
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(name="Fruit", slug="fruit")
+        cls.product = Product.objects.create(name="Apple", price=10, category=category, stock_quantity=5)
+        cls.users = [
+            User.objects.create_user(username=f"user{i}", email=f"user{i}@example.com", password="pw")
+            for i in range(3)
+        ]
+
+    def assertAggregates(self, count, average, distribution):
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.review_count, count)
+        self.assertEqual(self.product.average_rating, average)
+        self.assertEqual(self.product.rating_distribution, {**{str(v): 0 for v in range(1, 6)}, **distribution})
+
+    def test_reviews_are_counted_and_ratings_are_not(self):
+        ProductReview.objects.create(user=self.users[0], product=self.product, rating=4)
+        review = ProductReview.objects.create(user=self.users[1], product=self.product, rating=5)
+        ProductRating.objects.create(user=self.users[2], product=self.product, rating=1)
+        self.assertAggregates(2, Decimal("4.50"), {"4": 1, "5": 1})
+
+        review.rating = 2
+        review.save()
+        self.assertAggregates(2, Decimal("3.00"), {"2": 1, "4": 1})
+
+        review.delete()
+        self.assertAggregates(1, Decimal("4.00"), {"4": 1})
+
+    def test_rebuild_matches_signals(self):
+        ProductReview.objects.create(user=self.users[0], product=self.product, rating=3)
+        ProductRating.objects.create(user=self.users[1], product=self.product, rating=5)
+        Product.objects.filter(pk=self.product.pk).update(review_count=0, average_rating=None)
+        rebuild_rating_aggregates()
+        self.assertAggregates(1, Decimal("3.00"), {"3": 1})
+
+    def test_detail_count_matches_embedded_reviews(self):
+        ProductReview.objects.create(user=self.users[0], product=self.product, rating=4)
+        ProductRating.objects.create(user=self.users[1], product=self.product, rating=2)
+        data = self.client.get(f"/api/products/{self.product.slug}/").data
+        self.assertEqual(data["review_count"], len(data["reviews"]))
+
+
+@override_settings(CACHE_SHARED=True)
+class ConditionalGetTests(TestCase):
+    """If-None-Match on cached product responses."""
+
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(name="Fruit", slug="fruit")
+        cls.product = Product.objects.create(name="Apple", price=10, category=category, stock_quantity=5)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_matching_etag(self):
+        response = self.client.get(f"/api/products/{self.product.slug}/")
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(f"/api/products/{self.product.slug}/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+    def test_star_matches_an_existing_product(self):
+        response = self.client.get(f"/api/products/{self.product.slug}/", HTTP_IF_NONE_MATCH="*")
+        self.assertEqual(response.status_code, 304)
+
+    def test_star_does_not_hide_a_missing_product(self):
+        response = self.client.get("/api/products/no-such-product/", HTTP_IF_NONE_MATCH="*")
+        self.assertEqual(response.status_code, 404)
+
+
+class SuggestIndexTests(TestCase):
+    """The suggestion index is rebuilt lazily when products or categories change."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.fruit = Category.objects.create(name="Fruit", slug="fruit")
+        cls.apple = Product.objects.create(name="Táo Đà Lạt", price=10, category=cls.fruit, stock_quantity=5)
+
+    def setUp(self):
+        cache.clear()
+        invalidate_index()
+
+    def names(self, query):
+        return [entry["name"] for entry in suggest(query)]
+
+    def check_follows_changes(self):
+        self.assertEqual(self.names("tao da"), ["Táo Đà Lạt"])
+        self.apple.name = "Lê Hàn Quốc"
+        self.apple.save()
+        invalidate_index()
+        self.assertEqual(self.names("tao"), [])
+        self.assertEqual(self.names("le han"), ["Lê Hàn Quốc"])
+
+        self.apple.is_deleted = True
+        self.apple.save()
+        invalidate_index()
+        self.assertEqual(self.names("le"), [])
+
+    @override_settings(CACHE_SHARED=False)
+    def test_follows_changes_without_shared_cache(self):
+        self.check_follows_changes()
+
+    @override_settings(CACHE_SHARED=True)
+    def test_follows_changes_with_shared_cache(self):
+        self.check_follows_changes()
+
+    @override_settings(CACHE_SHARED=False)
+    def test_unchanged_rows_are_not_reloaded(self):
+        self.names("tao")
+        with self.assertNumQueries(0):
+            self.names("fruit")
+        invalidate_index()
+        # the fingerprint check only
+        with self.assertNumQueries(2):
+            self.assertEqual(self.names("fruit"), ["Fruit"])
+
+    @override_settings(CACHE_SHARED=True)
+    def test_version_check_skips_the_database(self):
+        self.names("tao")
+        invalidate_index()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.names("fruit"), ["Fruit"])
+
+
+class ProductExportImportTests(TestCase):
+    """Exported files import back unchanged, formula-like text included."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username="admin", email="admin@example.com", password="pw", is_staff=True
+        )
+        category = Category.objects.create(name="Fruit", slug="fruit")
+        Product.objects.create(
+            name="=HYPERLINK(\"http://evil\")", description="-5% today\n@home", price=10,
+            category=category, stock_quantity=3,
+        )
+        Product.objects.create(name="+84 Mango", description="'quoted", price="12.50", category=category, stock_quantity=0)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def snapshot(self):
+        return list(
+            Product.objects.order_by("id").values_list("slug", "name", "description", "price", "category_id", "stock_quantity")
+        )
+
+    def export(self, export_type):
+        response = self.client.get("/api/admin/products/export/", {"type": export_type})
+        self.assertEqual(response.status_code, 200)
+        return b"".join(response.streaming_content)
+
+    def reimport(self, content, export_type):
+        upload = SimpleUploadedFile(f"products.{export_type}", content)
+        response = self.client.post("/api/admin/products/import/", {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_csv_escapes_formulas_and_round_trips(self):
+        before = self.snapshot()
+        content = self.export("csv")
+        text = content.decode()
+        self.assertIn("'=HYPERLINK", text)
+        self.assertIn("'+84 Mango", text)
+        self.assertIn("'-5% today", text)
+        # a leading quote that does not guard a formula is left alone
+        self.assertNotIn("''quoted", text)
+
+        report = self.reimport(content, "csv")
+        self.assertEqual((report["errors"], report["created"], report["updated"]), ([], 0, 2))
+        self.assertEqual(self.snapshot(), before)
+
+    def test_jsonl_keeps_raw_values_and_round_trips(self):
+        before = self.snapshot()
+        content = self.export("jsonl")
+        self.assertIn('"name": "=HYPERLINK', content.decode())
+
+        report = self.reimport(content, "jsonl")
+        self.assertEqual((report["errors"], report["created"], report["updated"]), ([], 0, 2))
+        self.assertEqual(self.snapshot(), before)
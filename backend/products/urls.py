@@ -3,7 +3,9 @@ from django.urls import path
 from products.views import (
     CategoryListAPIView, CategoryDetailView, CategoryListCreateView,
     ProductListAPIView, ProductDetailAPIView, InstantProductSearchAPIView,
+    ProductReviewListAPIView, SearchSuggestAPIView,
     AdminProductListCreateView, AdminProductDetailView,
+    AdminProductImportView, AdminProductExportView,
     ProductRatingListCreateView, ProductRatingDetailView,
     AdminQuestionListView, AdminQuestionDetailView,
     ProductQuestionListCreateView,
@@ -31,6 +33,11 @@ urlpatterns = [
         ProductRatingDetailView.as_view(),
         name='product_rating_detail',
     ),
+    path(
+        'api/products/<slug:slug>/reviews/',
+        ProductReviewListAPIView.as_view(),
+        name='api_product_review_list',
+    ),
     # # Product Reviews
     # path(
     #     'api/products/<int:product_id>/reviews/',
@@ -67,6 +74,14 @@ urlpatterns = [
         'api/admin/products/', AdminProductListCreateView.as_view(),
         name='admin_product_list_create',
     ),
+    path(
+        'api/admin/products/import/', AdminProductImportView.as_view(),
+        name='admin_product_import',
+    ),
+    path(
+        'api/admin/products/export/', AdminProductExportView.as_view(),
+        name='admin_product_export',
+    ),
     path(
         'api/admin/products/<slug:slug>/', AdminProductDetailView.as_view(),
         name='admin_product_detail',
@@ -89,6 +104,11 @@ urlpatterns = [
         InstantProductSearchAPIView.as_view(),
         name='instant_product_search',
     ),
+    path(
+        'api/search/suggest/',
+        SearchSuggestAPIView.as_view(),
+        name='search_suggest',
+    ),
     path(
         'api/admin/questions/', 
         AdminQuestionListView.as_view(),
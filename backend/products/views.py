@@ -2,11 +2,12 @@
 from __future__ import annotations
 from time import timezone as _timezone  # not used for DB operations; keep timezone from django.utils below
 from django.utils import timezone
-from django.db.models import Q, Avg, Count, OuterRef, Subquery
+from django.db.models import Prefetch, Q
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 from rest_framework.permissions import AllowAny, IsAuthenticated, IsAdminUser
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.parsers import MultiPartParser
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework import generics, permissions, status
 from rest_framework.views import APIView
@@ -14,12 +15,22 @@ from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError, PermissionDenied
 import logging
 from django.db import IntegrityError, transaction
-
-from .models import Category, Product, ProductRating, ProductImage, ProductQuestion
+from backend.cache import CachedResponseMixin
+from backend.pagination import CursorModePaginationMixin
+from backend.streaming import streaming_export
+
+from .models import Category, Product, ProductRating, ProductReview, ProductImage, ProductQuestion
+from .categories import category_map, resolve_category_id
+from .constants import ReviewLimits
+from .importer import EXPORT_FIELDS, IMPORT_TYPES, export_rows, import_products
+from .facets import catalog_facet_summary, compute_facets, public_catalog
+from .search import search_products
+from .suggest import suggest
 from .serializers import (
     CategorySerializer,
     ProductListSerializer,
     ProductDetailSerializer,
+    ProductReviewListSerializer,
     ProductCreateUpdateSerializer,
     ProductSoftDeleteSerializer,
     ProductRatingSerializer,
@@ -30,11 +41,15 @@ from .serializers import (
 
 logger = logging.getLogger(__name__)
 
-# Pagination
-class ProductPagination(PageNumberPagination):
+# Models whose changes invalidate cached public product responses
+PRODUCT_CACHE_MODELS = (Product, Category, ProductImage, ProductReview, ProductRating)
+
+# Pagination (page numbers by default, keyset with ?cursor=)
+class ProductPagination(CursorModePaginationMixin, PageNumberPagination):
     page_size = 12
     page_size_query_param = "page_size"
     max_page_size = 50
+    cursor_fields = ("created_at", "price", "name")
 
 
 # CSRF exempt base
@@ -44,9 +59,10 @@ class CsrfExemptAPIView(APIView):
 
 
 # Category APIs
-class CategoryListAPIView(generics.ListAPIView):
+class CategoryListAPIView(CachedResponseMixin, generics.ListAPIView):
     serializer_class = CategorySerializer
     permission_classes = [AllowAny]
+    response_cache_models = (Category,)
     queryset = Category.objects.all().order_by("name")
 
 
@@ -63,51 +79,31 @@ class CategoryDetailView(CsrfExemptAPIView, generics.RetrieveUpdateDestroyAPIVie
     lookup_field = "slug"
 
 
-class ProductListAPIView(CsrfExemptAPIView, generics.ListAPIView):
+class ProductListAPIView(CachedResponseMixin, CsrfExemptAPIView, generics.ListAPIView):
     serializer_class = ProductListSerializer
     pagination_class = ProductPagination
     permission_classes = [AllowAny]
+    response_cache_models = PRODUCT_CACHE_MODELS
 
-    def get_queryset(self):
-        # Subquery: latest image_url per product (primary_image)
-        primary_image_subq = Subquery(
-            ProductImage.objects
-                .filter(product=OuterRef('pk'))
-                .order_by('-created_at')
-                .values('image_url')[:1]
-        )
+    # Any of these set means the materialized facet summary cannot be used
+    FACET_FILTER_PARAMS = ("category", "search", "min_price", "max_price")
 
-        queryset = (
-            Product.objects
-                .select_related("category")
-                .filter(is_in_stock=True, is_deleted=False)
-                .annotate(
-                    average_rating=Avg('reviews__rating'),
-                    review_count=Count('reviews'),
-                    primary_image=primary_image_subq
-                )
-        )
+    def filtered_queryset(self, apply_category=True):
+        """Catalog rows matching the request's filters (unordered)."""
+        queryset = public_catalog().select_related("category")
 
-        # category filter (slug or id)
-        category_param = self.request.query_params.get("category")
-        if category_param:
-            category_filtered = queryset.filter(category__slug=category_param)
-            if not category_filtered.exists():
-                try:
-                    category_filtered = queryset.filter(category_id=int(category_param))
-                except (ValueError, TypeError):
-                    pass
-            if category_filtered.exists():
-                queryset = category_filtered
-            else:
+        # category filter (slug or id), resolved in-process; see products/categories.py
+        if apply_category and self.request.query_params.get("category"):
+            category_id = self.selected_category_id()
+            if category_id is None:
                 queryset = queryset.none()
+            else:
+                queryset = queryset.filter(category_id=category_id)
 
-        # search
-        search = self.request.query_params.get("search")
+        # search (ranked; see products/search.py)
+        search = self.request.query_params.get("search", "").strip()
         if search:
-            queryset = queryset.filter(
-                Q(name__icontains=search) | Q(description__icontains=search) | Q(category__name__icontains=search)
-            )
+            queryset = search_products(queryset, search)
 
         # price range
         min_price = self.request.query_params.get("min_price")
@@ -123,24 +119,99 @@ class ProductListAPIView(CsrfExemptAPIView, generics.ListAPIView):
             except (ValueError, TypeError):
                 pass
 
-        ordering = self.request.query_params.get("ordering", "-created_at")
+        return queryset
+
+    def categories(self):
+        # one map per request, however many times the category is resolved
+        if not hasattr(self, "_categories"):
+            self._categories = category_map()
+        return self._categories
+
+    def selected_category_id(self):
+        category_param = self.request.query_params.get("category")
+        return resolve_category_id(category_param, self.categories()) if category_param else None
+
+    def get_queryset(self):
+        queryset = self.filtered_queryset()
+
+        ordering = self.request.query_params.get("ordering")
         valid_orderings = ["name", "-name", "price", "-price", "created_at", "-created_at"]
         if ordering in valid_orderings:
             queryset = queryset.order_by(ordering)
-        else:
+        elif not self.request.query_params.get("search", "").strip():
+            # searches keep their relevance ordering unless one is requested
             queryset = queryset.order_by("-created_at")
 
         return queryset
 
+    def get_facets(self):
+        params = self.request.query_params
+        if not any(params.get(name) for name in self.FACET_FILTER_PARAMS):
+            return catalog_facet_summary()
+        if params.get("category") and self.selected_category_id() is None:
+            return compute_facets(public_catalog().none())
+        return compute_facets(
+            self.filtered_queryset(apply_category=False),
+            category_id=self.selected_category_id(),
+            categories=self.categories(),
+        )
 
-class ProductDetailAPIView(CsrfExemptAPIView, generics.RetrieveAPIView):
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        if request.query_params.get("facets", "").lower() in ("1", "true", "yes"):
+            # ?facets=1 adds category / price / rating counts; see products/facets.py
+            response.data["facets"] = self.get_facets()
+        return response
+
+
+def product_detail_queryset():
+    """
+    Products with everything ProductDetailSerializer needs: category joined,
+    images and the latest reviews (with their users) prefetched, so a detail
+    response costs three queries however many reviews the product has.
+    """
+    latest_reviews = (
+        ProductReview.objects
+            .select_related("user")
+            .order_by("-created_at")[:ReviewLimits.DETAIL_EMBEDDED]
+    )
+    return (
+        Product.objects
+            .select_related("category")
+            .prefetch_related(
+                "images",
+                Prefetch("reviews", queryset=latest_reviews, to_attr="latest_reviews"),
+            )
+    )
+
+
+class ProductDetailAPIView(CachedResponseMixin, CsrfExemptAPIView, generics.RetrieveAPIView):
     serializer_class = ProductDetailSerializer
     permission_classes = [AllowAny]
     lookup_field = "slug"
+    response_cache_models = PRODUCT_CACHE_MODELS
+
+    def get_queryset(self):
+        return product_detail_queryset().filter(is_deleted=False)
+
+
+class ProductReviewListAPIView(CachedResponseMixin, CsrfExemptAPIView, generics.ListAPIView):
+    """
+    Public Endpoint:
+    GET: Paginated reviews of a product (slug), newest first
+    """
+    serializer_class = ProductReviewListSerializer
+    permission_classes = [AllowAny]
+    pagination_class = ProductPagination
+    response_cache_models = (ProductReview, Product)
 
     def get_queryset(self):
-        # select_related for category; detail will evaluate reviews/images lazily
-        return Product.objects.select_related("category").filter(is_deleted=False)
+        return (
+            ProductReview.objects
+                .select_related("user")
+                .filter(product__slug=self.kwargs["slug"], product__is_deleted=False)
+                .order_by("-created_at")
+        )
 
 
 class InstantProductSearchAPIView(CsrfExemptAPIView, APIView):
@@ -164,12 +235,9 @@ class InstantProductSearchAPIView(CsrfExemptAPIView, APIView):
             limit = 10
 
         try:
-            products = Product.objects.select_related('category').filter(
-                Q(name__icontains=query) |
-                Q(description__icontains=query) |
-                Q(category__name__icontains=query),
-                is_in_stock=True,
-                is_deleted=False
+            products = search_products(
+                Product.objects.select_related('category').filter(is_in_stock=True, is_deleted=False),
+                query,
             )[:limit]
 
             serializer = ProductListSerializer(products, many=True)
@@ -180,28 +248,36 @@ class InstantProductSearchAPIView(CsrfExemptAPIView, APIView):
                             status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-# ---------- Admin product list/create with annotations ----------
+class SearchSuggestAPIView(CsrfExemptAPIView, APIView):
+    """
+    GET /api/search/suggest/?q=...&limit=8
+    Product/category name suggestions from the in-memory prefix index
+    (products/suggest.py); once the index is loaded, the database is only
+    consulted when the indexed rows change.
+    """
+    permission_classes = [AllowAny]
+    authentication_classes = []
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        try:
+            limit = min(max(int(request.query_params.get('limit', 8)), 1), 20)
+        except (ValueError, TypeError):
+            limit = 8
+
+        results = suggest(query, limit) if query else []
+        return Response({'query': query, 'results': results})
+
+
+# ---------- Admin product list/create ----------
 class AdminProductListCreateView(generics.ListCreateAPIView):
     permission_classes = [IsAdminUser]
 
     def get_queryset(self):
-        # Subquery to fetch latest image_url per product
-        primary_image_subq = Subquery(
-            ProductImage.objects
-                .filter(product=OuterRef('pk'))
-                .order_by('-created_at')
-                .values('image_url')[:1]
-        )
-
         qs = (
             Product.objects
                 .filter(is_deleted=False)
                 .select_related('category')
-                .annotate(
-                    average_rating=Avg('reviews__rating'),
-                    review_count=Count('reviews'),
-                    primary_image=primary_image_subq
-                )
                 .order_by('-created_at')
         )
         return qs
@@ -232,11 +308,58 @@ class AdminProductListCreateView(generics.ListCreateAPIView):
         return ProductListSerializer
 
 
+class AdminProductImportView(CsrfExemptAPIView):
+    """
+    Admin Endpoint:
+    POST: multipart `file` (CSV or JSONL, `?type=` or file extension);
+          returns created/updated counts and per-row errors
+    """
+    permission_classes = [IsAdminUser]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'detail': 'Vui lòng chọn tệp để nhập.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        import_type = request.query_params.get('type') or upload.name.rsplit('.', 1)[-1].lower()
+        if import_type not in IMPORT_TYPES:
+            return Response({'detail': 'Định dạng tệp không hợp lệ (csv hoặc jsonl).'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            batch_size = min(max(int(request.query_params.get('batch_size', 500)), 1), 2000)
+        except (TypeError, ValueError):
+            batch_size = 500
+
+        report = import_products(upload, import_type, batch_size=batch_size)
+        return Response(report, status=status.HTTP_200_OK)
+
+
+class AdminProductExportView(CsrfExemptAPIView):
+    """
+    Admin Endpoint:
+    GET: stream all non-deleted products as CSV (default) or JSONL (`?type=jsonl`)
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        export_type = request.query_params.get('type', 'csv')
+        if export_type not in IMPORT_TYPES:
+            return Response({'detail': 'Định dạng không hợp lệ (csv hoặc jsonl).'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        return streaming_export(EXPORT_FIELDS, export_rows(), export_type, 'products')
+
+
 class AdminProductDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Product.objects.all()
     permission_classes = [IsAdminUser]
     lookup_field = "slug"
 
+    def get_queryset(self):
+        if self.request.method == 'GET':
+            return product_detail_queryset()
+        return Product.objects.all()
+
     def get_serializer_class(self):
         if self.request.method in ['PUT', 'PATCH']:
             return ProductCreateUpdateSerializer
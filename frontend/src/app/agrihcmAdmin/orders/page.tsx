@@ -53,6 +53,9 @@ const getAuthHeaders = () => {
 export default function AdminOrdersPage() {
   const [orders, setOrders] = useState<Order[]>([]);
   const [loading, setLoading] = useState<boolean>(false);
+  const [page, setPage] = useState<number>(1);
+  const [count, setCount] = useState<number>(0);
+  const [hasNext, setHasNext] = useState<boolean>(false);
 
   const [openId, setOpenId] = useState<number | null>(null);
   const [detail, setDetail] = useState<Order | null>(null);
@@ -66,12 +69,12 @@ export default function AdminOrdersPage() {
 
   useEffect(() => {
     fetchList();
-  }, []);
+  }, [page]);
 
   async function fetchList() {
     setLoading(true);
     try {
-      const res = await fetch(`${API_BASE}/api/admin/orders/?ordering=-created_at`, {
+      const res = await fetch(`${API_BASE}/api/admin/orders/?ordering=-created_at&page=${page}`, {
         headers: getAuthHeaders(),
         credentials: "include",
         cache: "no-store",
@@ -80,9 +83,12 @@ export default function AdminOrdersPage() {
       const data = await res.json();
       const list: Order[] = Array.isArray(data) ? data : data.results ?? [];
       setOrders(list);
+      setCount(Array.isArray(data) ? list.length : data.count ?? list.length);
+      setHasNext(!Array.isArray(data) && Boolean(data.next));
     } catch (err) {
       console.error("fetchList error", err);
       setOrders([]);
+      setHasNext(false);
     } finally {
       setLoading(false);
     }
@@ -286,6 +292,19 @@ export default function AdminOrdersPage() {
         </TableBody>
       </Table>
 
+      <div className="mt-4 flex items-center justify-between text-sm text-muted-foreground">
+        <span>{count} orders</span>
+        <div className="flex items-center gap-2">
+          <Button variant="outline" size="sm" onClick={() => setPage((p) => p - 1)} disabled={loading || page <= 1}>
+            Previous
+          </Button>
+          <span>Page {page}</span>
+          <Button variant="outline" size="sm" onClick={() => setPage((p) => p + 1)} disabled={loading || !hasNext}>
+            Next
+          </Button>
+        </div>
+      </div>
+
       {openId !== null && detail && (
         <div className="fixed inset-0 z-50 flex items-end sm:items-center justify-center p-4">
           <div className="absolute inset-0 bg-black/40" onClick={closeModal} />
@@ -34,6 +34,11 @@ type Order = {
   customer_name?: string;
 };
 
+type Analytics = {
+  daily: { day: string; order_count: number; revenue: string }[];
+  by_status: { status: string; order_count: number; revenue: string }[];
+};
+
 type Product = { id: number; name?: string };
 type Blog = { id: number; title?: string };
 
@@ -85,6 +90,7 @@ function arcPath(cx: number, cy: number, rOuter: number, rInner: number, startAn
 
 export default function AdminDashboardPageClient() {
   const [orders, setOrders] = useState<Order[] | null>(null);
+  const [analytics, setAnalytics] = useState<Analytics | null>(null);
   const [products, setProducts] = useState<Product[] | null>(null);
   const [blogs, setBlogs] = useState<Blog[] | null | "NO_ACCESS">(null);
   const [ordersLoading, setOrdersLoading] = useState(false);
@@ -101,7 +107,8 @@ export default function AdminDashboardPageClient() {
     setOrdersLoading(true);
     setError(null);
     try {
-      const res = await fetch(`${API_BASE}/api/admin/orders/?ordering=-created_at`, {
+      // only the latest orders; totals come from the sales rollups
+      const res = await fetch(`${API_BASE}/api/admin/orders/?ordering=-created_at&page_size=8`, {
         headers: getAuthHeaders(), // HYBRID: Use Header
         credentials: "include",    // HYBRID: AND use Cookie
         cache: "no-store",
@@ -119,6 +126,24 @@ export default function AdminDashboardPageClient() {
     }
   }
 
+  async function fetchAnalytics() {
+    // the widest range the analytics endpoint serves (366 days)
+    const start = new Date(Date.now() - 365 * 24 * 60 * 60 * 1000).toISOString().slice(0, 10);
+    try {
+      const res = await fetch(`${API_BASE}/api/admin/analytics/?start=${start}`, {
+        headers: getAuthHeaders(),
+        credentials: "include",
+        cache: "no-store",
+      });
+      if (!res.ok) throw new Error(`Analytics fetch failed (${res.status})`);
+      setAnalytics(await res.json());
+    } catch (e: any) {
+      console.error("fetchAnalytics:", e);
+      setError((prev) => prev || "Failed to load sales figures");
+      setAnalytics(null);
+    }
+  }
+
   async function fetchProducts() {
     setProductsLoading(true);
     try {
@@ -181,7 +206,7 @@ export default function AdminDashboardPageClient() {
     setGlobalRefreshing(true);
     setError(null);
     try {
-      await Promise.all([fetchOrders(), fetchProducts(), fetchBlogs()]);
+      await Promise.all([fetchOrders(), fetchAnalytics(), fetchProducts(), fetchBlogs()]);
     } finally {
       setTimeout(() => setGlobalRefreshing(false), 200);
     }
@@ -189,24 +214,22 @@ export default function AdminDashboardPageClient() {
 
   const orderStatusCounts = useMemo(() => {
     const counts: Record<string, number> = {};
-    if (!orders) return counts;
-    for (const o of orders) {
-      const s = o.status ?? "UNKNOWN";
-      counts[s] = (counts[s] || 0) + 1;
+    if (!analytics) return counts;
+    for (const row of analytics.by_status) {
+      counts[row.status] = row.order_count;
     }
     return counts;
-  }, [orders]);
+  }, [analytics]);
 
   const slices = useMemo(() => computePieSlices(orderStatusCounts), [orderStatusCounts]);
 
   const totalRevenue = useMemo(() => {
-    if (!orders) return 0;
-    return orders.reduce((sum, o) => {
-      const v = o.final_amount ?? 0;
-      const n = typeof v === "string" ? parseFloat((v as string) || "0") : Number(v || 0);
+    if (!analytics) return 0;
+    return analytics.daily.reduce((sum, row) => {
+      const n = parseFloat(row.revenue || "0");
       return sum + (isNaN(n) ? 0 : n);
     }, 0);
-  }, [orders]);
+  }, [analytics]);
 
   const recentOrders = useMemo(() => {
     if (!orders) return [];
@@ -230,15 +253,15 @@ export default function AdminDashboardPageClient() {
         <Card>
           <CardHeader className="flex items-center justify-between">
             <CardTitle>Orders</CardTitle>
-            <Button size="sm" variant="ghost" onClick={fetchOrders} disabled={ordersLoading}>
+            <Button size="sm" variant="ghost" onClick={() => Promise.all([fetchOrders(), fetchAnalytics()])} disabled={ordersLoading}>
               {ordersLoading ? "..." : "Refresh"}
             </Button>
           </CardHeader>
           <CardContent>
             <div className="text-3xl font-semibold">
-              {orders ? Object.values(orderStatusCounts).reduce((a, b) => a + b, 0) : "—"}
+              {analytics ? Object.values(orderStatusCounts).reduce((a, b) => a + b, 0) : "—"}
             </div>
-            <div className="text-sm text-muted-foreground mt-1">Total orders</div>
+            <div className="text-sm text-muted-foreground mt-1">Orders, last 12 months</div>
           </CardContent>
         </Card>
 
@@ -300,7 +323,7 @@ export default function AdminDashboardPageClient() {
                       })}
                       <circle r="36" fill="#fff" stroke="#f1f5f9" strokeWidth="1" />
                       <text x="0" y="-4" textAnchor="middle" style={{ fontSize: 12, fontWeight: 600, fill: "#0f172a" }}>
-                        {orders ? Object.values(orderStatusCounts).reduce((a, b) => a + b, 0) : 0}
+                        {analytics ? Object.values(orderStatusCounts).reduce((a, b) => a + b, 0) : 0}
                       </text>
                       <text x="0" y="12" textAnchor="middle" style={{ fontSize: 11, fill: "#6b7280" }}>
                         Orders
@@ -344,7 +367,7 @@ export default function AdminDashboardPageClient() {
             <div className="space-y-3">
               <div className="flex items-center justify-between">
                 <div className="text-sm text-muted-foreground">Orders</div>
-                <div className="font-medium">{orders ? Object.values(orderStatusCounts).reduce((a, b) => a + b, 0) : "—"}</div>
+                <div className="font-medium">{analytics ? Object.values(orderStatusCounts).reduce((a, b) => a + b, 0) : "—"}</div>
               </div>
               <div className="flex items-center justify-between">
                 <div className="text-sm text-muted-foreground">Products</div>
@@ -60,23 +60,27 @@ export default function OrdersPage() {
   const [error, setError] = useState<string | null>(null);
   const [selected, setSelected] = useState<Order | null>(null);
   const [actionLoading, setActionLoading] = useState(false);
+  const [nextUrl, setNextUrl] = useState<string | null>(null);
 
   const isCancellable = (status?: string | null) => {
     if (!status) return false;
     return status === "PENDING";
   };
 
-  async function fetchOrders() {
+  // `url` is the `next` link of the last page; without it the first page is loaded
+  async function fetchOrders(url?: string) {
     setLoading(true);
     setError(null);
     try {
-      const res = await fetch(`${API_BASE}/api/orders/`, { 
+      const res = await fetch(url ?? `${API_BASE}/api/orders/?expand=items`, { 
           headers: getAuthHeaders(),
           credentials: "include"
       });
       if (!res.ok) throw new Error(`Failed to load orders (${res.status})`);
       const data = await res.json();
-      setOrders(data);
+      const page: Order[] = Array.isArray(data) ? data : data.results;
+      setOrders((prev) => (url && prev ? [...prev, ...page] : page));
+      setNextUrl(Array.isArray(data) ? null : data.next);
     } catch (e: any) {
       setError(e.message || "Unknown error");
     } finally {
@@ -134,7 +138,7 @@ export default function OrdersPage() {
         <div className="py-8 text-center text-gray-600">You have no orders yet.</div>
       )}
 
-      {!loading && orders && (
+      {orders && (
         <div className="space-y-4">
           {orders.map((o) => (
             <div key={o.id} className="border rounded-lg p-4 flex items-start justify-between">
@@ -161,6 +165,13 @@ export default function OrdersPage() {
               </div>
             </div>
           ))}
+          {nextUrl && (
+            <div className="text-center">
+              <button onClick={() => fetchOrders(nextUrl)} className="px-4 py-2 rounded border text-sm hover:bg-slate-50">
+                Xem thêm
+              </button>
+            </div>
+          )}
         </div>
       )}
 